@@ -12,11 +12,12 @@ API请求脚本 - 支持API请求和响应处理
 
 import argparse
 import json
+import re
 import sys
 import os
 from typing import Dict, Any, Optional, Union, List
-from pathlib import Path
 import traceback
+from functools import lru_cache
 import requests
 from datetime import datetime
 import base64
@@ -34,9 +35,17 @@ from src.core.error_handler import (
     validate_parameters,
     create_success_response,
     create_file_response,
+    dump_json_bytes,
     print_json_response
 )
 
+# orjson 可选：用于JSON参数解析和缓存键，缺失时回退到标准库json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # =============================================================================
 # 参数定义区域
 # =============================================================================
@@ -80,10 +89,48 @@ ARGS_MAP = {
     "debug": {"flag": "--debug", "type": "bool", "required": False, "help": "调试模式", "default": False},
 }
 
+# 携带请求体的HTTP方法
+METHODS_WITH_BODY = frozenset({"POST", "PUT", "PATCH"})
+
+@lru_cache(maxsize=32)
+def get_method_profile(method: str) -> bool:
+    """
+    按HTTP方法预先计算请求形态，同一方法只计算一次
+    返回是否携带请求体
+    """
+    return method.upper() in METHODS_WITH_BODY
+
+# URL格式校验（模块加载时预编译）
+URL_PATTERN = re.compile(r'^https?://[^\s/$.?#][^\s]*\Z', re.IGNORECASE)
+
 # =============================================================================
 # 辅助函数区域
 # =============================================================================
 
+# 已确认存在的输出目录，避免重复的 stat/mkdir 系统调用
+_MKDIR_CACHE: set = set()
+
+
+def ensure_dir(path: str) -> None:
+    """确保目录存在（同一目录只创建一次）"""
+    if path in _MKDIR_CACHE:
+        return
+    os.makedirs(path, exist_ok=True)
+    _MKDIR_CACHE.add(path)
+
+
+def parse_json_param(value: Any) -> Any:
+    """解析JSON格式的参数，非字符串原样返回，解析失败返回空字典"""
+    if not isinstance(value, str):
+        return value
+    try:
+        if ORJSON_AVAILABLE:
+            return orjson.loads(value)
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return {}
+
+
 def get_schema() -> str:
     """返回参数定义的JSON格式字符串"""
     return json.dumps(ARGS_MAP, ensure_ascii=False)
@@ -102,6 +149,13 @@ def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[D
             value=url
         ).to_dict()
     
+    if not URL_PATTERN.match(url):
+        return False, ValidationError(
+            message="URL格式无效，必须以 http:// 或 https:// 开头",
+            parameter="url",
+            value=url
+        ).to_dict()
+    
     # 验证超时时间
     timeout = params.get('timeout', 30)
     if timeout <= 0:
@@ -141,16 +195,14 @@ def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[D
     
     # 验证输出目录，不存在则创建
     output_dir = params.get('output_dir', './output')
-    output_path = Path(output_dir)
-    if not output_path.exists():
-        try:
-            output_path.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            return False, ValidationError(
-                message=f"无法创建输出目录: {str(e)}",
-                parameter="output_dir",
-                value=output_dir
-            ).to_dict()
+    try:
+        ensure_dir(output_dir)
+    except Exception as e:
+        return False, ValidationError(
+            message=f"无法创建输出目录: {str(e)}",
+            parameter="output_dir",
+            value=output_dir
+        ).to_dict()
     
     return True, None
 
@@ -201,11 +253,25 @@ def extract_data_from_response(response_data: Any, extract_path: str) -> Any:
         return None
 
 
-def save_response_to_file(response: requests.Response, output_dir: str, url: str) -> Optional[str]:
+def encode_body_base64(response: requests.Response) -> str:
+    """
+    返回响应体的base64编码
+    编码结果缓存在响应对象上，结果数据和响应文件共用同一份字符串
+    """
+    encoded = getattr(response, '_body_base64', None)
+    if encoded is None:
+        encoded = base64.b64encode(response.content).decode('ascii')
+        response._body_base64 = encoded
+    return encoded
+
+
+def save_response_to_file(response: requests.Response, output_dir: str, url: str,
+                          now: Optional[datetime] = None, timestamp: Optional[str] = None) -> Optional[str]:
     """保存响应到文件"""
     try:
-        # 生成文件名
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # 生成文件名（优先复用本次请求的时间戳）
+        now = now or datetime.now()
+        timestamp = timestamp or now.strftime("%Y%m%d_%H%M%S")
         url_hash = abs(hash(url)) % 10000  # 简单的URL哈希
         filename = f"api_response_{timestamp}_{url_hash}.json"
         output_file = os.path.join(output_dir, filename)
@@ -216,7 +282,7 @@ def save_response_to_file(response: requests.Response, output_dir: str, url: str
             "method": response.request.method,
             "status_code": response.status_code,
             "headers": dict(response.headers),
-            "timestamp": datetime.now().isoformat()
+            "timestamp": now.isoformat()
         }
         
         # 尝试解析响应体
@@ -225,56 +291,34 @@ def save_response_to_file(response: requests.Response, output_dir: str, url: str
                 response_data["body"] = response.json()
             else:
                 # 对于非JSON响应，保存为base64编码的字符串
-                response_data["body_base64"] = base64.b64encode(response.content).decode('utf-8')
+                response_data["body_base64"] = encode_body_base64(response)
                 response_data["content_type"] = response.headers.get('content-type', '')
         except Exception:
-            response_data["body_base64"] = base64.b64encode(response.content).decode('utf-8')
+            response_data["body_base64"] = encode_body_base64(response)
             response_data["content_type"] = response.headers.get('content-type', '')
         
         # 保存到文件
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(response_data, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(dump_json_bytes(response_data))
         
         return output_file
     except Exception as e:
         return None
 
 
-def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
+def process_business_logic(params: Dict[str, Any], now: Optional[datetime] = None,
+                           timestamp: Optional[str] = None) -> Dict[str, Any]:
     """处理业务逻辑的核心函数"""
+    now = now or datetime.now()
     url = params.get('url')
     method = params.get('method', 'GET')
     
     # 解析JSON参数
-    headers = params.get('headers', '{}')
-    if isinstance(headers, str):
-        try:
-            headers = json.loads(headers)
-        except json.JSONDecodeError:
-            headers = {}
-    
-    data = params.get('data', '{}')
-    if isinstance(data, str):
-        try:
-            data = json.loads(data)
-        except json.JSONDecodeError:
-            data = {}
-    
-    query_params = params.get('params', '{}')
-    if isinstance(query_params, str):
-        try:
-            query_params = json.loads(query_params)
-        except json.JSONDecodeError:
-            query_params = {}
-    
+    headers = parse_json_param(params.get('headers', '{}'))
+    data = parse_json_param(params.get('data', '{}'))
+    query_params = parse_json_param(params.get('params', '{}'))
     auth_type = params.get('auth_type', 'none')
-    
-    auth_info = params.get('auth_info', '{}')
-    if isinstance(auth_info, str):
-        try:
-            auth_info = json.loads(auth_info)
-        except json.JSONDecodeError:
-            auth_info = {}
+    auth_info = parse_json_param(params.get('auth_info', '{}'))
     output_dir = params.get('output_dir', './output')
     save_response = params.get('save_response', False)
     extract_data_path = params.get('extract_data', '')
@@ -298,15 +342,12 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
         'timeout': timeout
     }
     
-    # 根据方法添加不同的参数
-    if method.upper() in ['GET', 'DELETE', 'HEAD', 'OPTIONS']:
-        if query_params:
-            request_params['params'] = query_params
-    elif method.upper() in ['POST', 'PUT', 'PATCH']:
-        if data:
-            request_params['json'] = data
-        if query_params:
-            request_params['params'] = query_params
+    # 根据方法添加不同的参数：所有方法都携带查询参数，仅带请求体的方法发送JSON数据
+    has_body = get_method_profile(method)
+    if query_params:
+        request_params['params'] = query_params
+    if has_body and data:
+        request_params['json'] = data
     
     # 添加认证
     if auth:
@@ -318,14 +359,14 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
         "url": url,
         "headers": headers,
         "params": query_params,
-        "data": data if method.upper() in ['POST', 'PUT', 'PATCH'] else None,
+        "data": data if has_body else None,
         "auth_type": auth_type,
         "timeout": timeout
     }
     
     result_data = {
         "request": request_info,
-        "timestamp": datetime.now().isoformat()
+        "timestamp": now.isoformat()
     }
     
     try:
@@ -362,15 +403,15 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
                         result_data["extract_error"] = f"无法从路径 '{extract_path}' 提取数据"
             else:
                 # 对于非JSON响应，保存为base64编码的字符串
-                result_data["response"]["body_base64"] = base64.b64encode(response.content).decode('utf-8')
+                result_data["response"]["body_base64"] = encode_body_base64(response)
                 result_data["response"]["content_type"] = response.headers.get('content-type', '')
         except Exception as e:
             result_data["response"]["parse_error"] = str(e)
-            result_data["response"]["body_base64"] = base64.b64encode(response.content).decode('utf-8')
+            result_data["response"]["body_base64"] = encode_body_base64(response)
         
         # 保存响应到文件（如果需要）
         if save_response:
-            response_file = save_response_to_file(response, output_dir, url)
+            response_file = save_response_to_file(response, output_dir, url, now, timestamp)
             if response_file:
                 result_data["response_file"] = response_file
                 if verbose:
@@ -428,17 +469,18 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
         return result_data
 
 
-def generate_output_file(params: Dict[str, Any], result_data: Dict[str, Any]) -> Optional[str]:
+def generate_output_file(params: Dict[str, Any], result_data: Dict[str, Any],
+                         timestamp: Optional[str] = None) -> Optional[str]:
     """生成输出文件（可选）"""
     output_dir = params.get('output_dir', './output')
     
     # 生成请求结果文件
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    timestamp = timestamp or datetime.now().strftime("%Y%m%d_%H%M%S")
     output_file = os.path.join(output_dir, f'api_request_result_{timestamp}.json')
     
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(dump_json_bytes(result_data))
         return output_file
     except Exception as e:
         if params.get('debug', False):
@@ -466,9 +508,13 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
     if not is_valid:
         return error_result
     
+    # 本次请求的时间只取一次，供业务逻辑和输出文件复用
+    now = datetime.now()
+    timestamp = now.strftime("%Y%m%d_%H%M%S")
+    
     # 3. 处理业务逻辑
     try:
-        result_data = process_business_logic(params)
+        result_data = process_business_logic(params, now, timestamp)
     except Exception as e:
         if params.get('debug', False):
             print(f"业务逻辑处理失败: {str(e)}", file=sys.stderr)
@@ -480,7 +526,7 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
         ).to_dict()
     
     # 4. 生成输出文件（如果需要）
-    output_file = generate_output_file(params, result_data)
+    output_file = generate_output_file(params, result_data, timestamp)
     
     # 5. 构建响应数据
     response_data = result_data
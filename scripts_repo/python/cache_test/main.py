@@ -37,7 +37,8 @@ def main():
             "cache_test": "error"
         }
     
-    print(json.dumps(output, ensure_ascii=False))
+    sys.stdout.buffer.write(json.dumps(output, ensure_ascii=False).encode('utf-8') + b"\n")
+    sys.stdout.buffer.flush()
 
 if __name__ == "__main__":
     main()
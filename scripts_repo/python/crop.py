@@ -36,9 +36,10 @@ def main():
     w, h = parse_size(size_str)
 
     with Image.open(img_path) as im:
-        # 简单缩放到指定尺寸
-        im = im.convert("RGBA")
-        im = im.resize((w, h))
+        # 只有带透明数据（alpha通道或调色板/颜色键透明）的源图才转为RGBA，其余按RGB缩放以减少一个通道的数据量
+        mode = "RGBA" if im.has_transparency_data else "RGB"
+        im = im.convert(mode)
+        im = im.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
         buf = BytesIO()
         im.save(buf, format="PNG")
         sys.stdout.buffer.write(buf.getvalue())
@@ -19,19 +19,43 @@ from src.core.error_handler import (
     print_json_response
 )
 
-# 尝试导入pandas
-try:
-    import pandas as pd
-    PANDAS_AVAILABLE = True
-except ImportError:
-    PANDAS_AVAILABLE = False
-    IMPORT_ERROR = "缺少pandas库，请使用 pip install pandas 安装"
+# pandas/pyarrow 延迟到真正处理数据时才导入，--_sys_get_schema 探测无需加载
+pd = None
+IMPORT_ERROR = "缺少pandas库，请使用 pip install pandas 安装"
+
+
+def load_pandas():
+    """按需导入pandas，返回是否可用"""
+    global pd
+    if pd is None:
+        try:
+            import pandas
+        except ImportError:
+            return False
+        pd = pandas
+    return True
+
 
 ARGS_MAP = {
     "data": {"flag": "--data", "type": "str", "required": True, "help": "CSV数据或文件路径"},
     "operation": {"flag": "--operation", "type": "str", "required": False, "help": "操作类型(sum/mean/count)", "default": "sum"}
 }
 
+def read_csv(source, is_text=False):
+    """读取CSV，优先使用pyarrow；source为CSV字符串(is_text=True)或文件路径"""
+    try:
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return pd.read_csv(StringIO(source) if is_text else source)
+    
+    reader_input = pa.BufferReader(source.encode('utf-8')) if is_text else source
+    try:
+        return pa_csv.read_csv(reader_input).to_pandas()
+    except pa.ArrowInvalid as e:
+        raise pd.errors.ParserError(str(e)) from e
+
+
 def get_schema():
     """返回参数定义的JSON格式"""
     return json.dumps(ARGS_MAP, ensure_ascii=False)
@@ -41,7 +65,7 @@ def get_schema():
 def process_data_analysis(params):
     """处理数据分析请求"""
     # 检查依赖是否可用
-    if not PANDAS_AVAILABLE:
+    if not load_pandas():
         return ScriptError(
             message=f"缺少必要依赖: {IMPORT_ERROR}",
             error_type=ErrorType.RESOURCE,
@@ -77,7 +101,7 @@ def process_data_analysis(params):
         # 尝试读取CSV数据
         if '\n' in data_input or ',' in data_input:
             # 直接是CSV字符串
-            df = pd.read_csv(StringIO(data_input))
+            df = read_csv(data_input, is_text=True)
             data_type = "string"
         else:
             # 可能是文件路径
@@ -88,7 +112,7 @@ def process_data_analysis(params):
                     resource_path=data_input
                 ).to_dict()
             
-            df = pd.read_csv(data_input)
+            df = read_csv(data_input)
             data_type = "file"
         
         # 验证数据不为空
@@ -106,25 +130,18 @@ def process_data_analysis(params):
             "data_type": data_type
         }
         
-        # 根据操作类型计算结果
-        if operation == "sum":
-            numeric_cols = df.select_dtypes(include=['number']).columns
-            if len(numeric_cols) == 0:
-                return ValidationError(
-                    message="数据中没有数值列，无法执行求和操作",
-                    parameter="operation"
-                ).to_dict()
-            result_data["summary"] = {col: float(df[col].sum()) for col in numeric_cols}
-        elif operation == "mean":
+        # 根据操作类型计算结果（一次 agg 调用完成所有列的归约）
+        if operation == "count":
+            result_data["summary"] = df.agg("count").astype(int).to_dict()
+        else:
             numeric_cols = df.select_dtypes(include=['number']).columns
             if len(numeric_cols) == 0:
+                action = "求和操作" if operation == "sum" else "平均值计算"
                 return ValidationError(
-                    message="数据中没有数值列，无法执行平均值计算",
+                    message=f"数据中没有数值列，无法执行{action}",
                     parameter="operation"
                 ).to_dict()
-            result_data["summary"] = {col: float(df[col].mean()) for col in numeric_cols}
-        elif operation == "count":
-            result_data["summary"] = {col: int(df[col].count()) for col in df.columns}
+            result_data["summary"] = df[numeric_cols].agg(operation).astype(float).to_dict()
         
         # 创建成功响应
         return create_success_response(
@@ -155,14 +172,14 @@ def process_data_analysis(params):
 
 def main():
     """主函数"""
-    parser = argparse.ArgumentParser()
-    for key, cfg in ARGS_MAP.items():
-        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
-    
     if len(sys.argv) > 1 and sys.argv[1] == "--_sys_get_schema":
         print(get_schema())
         sys.exit(0)
     
+    parser = argparse.ArgumentParser()
+    for key, cfg in ARGS_MAP.items():
+        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
+    
     args = parser.parse_args()
     
     # 构建参数字典
@@ -10,23 +10,20 @@
 4. 可以导出分析结果和图表
 """
 
+from __future__ import annotations
+
 import argparse
 import json
+import re
 import sys
 import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Union, List
 from pathlib import Path
 import traceback
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 
-# 设置中文字体
-plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
-plt.rcParams['axes.unicode_minus'] = False
-
 # 添加项目根目录到Python路径，以便导入error_handler模块
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 sys.path.insert(0, project_root)
@@ -40,9 +37,36 @@ from src.core.error_handler import (
     validate_parameters,
     create_success_response,
     create_file_response,
-    print_json_response
+    print_json_response,
+    dump_json_bytes
 )
 
+# 重量级依赖延迟到真正分析时才导入，--_sys_get_schema 探测无需加载
+pd = None
+np = None
+plt = None
+
+
+def load_analysis_modules() -> None:
+    """按需导入pandas和numpy"""
+    global pd, np
+    if pd is None:
+        import pandas
+        import numpy
+        pd, np = pandas, numpy
+
+
+def load_plotting_modules() -> None:
+    """按需导入matplotlib（非交互式Agg后端），并设置中文字体"""
+    global plt
+    if plt is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot
+        plt = matplotlib.pyplot
+        plt.rcParams['font.sans-serif'] = ['SimHei', 'Arial Unicode MS', 'DejaVu Sans']
+        plt.rcParams['axes.unicode_minus'] = False
+
 # =============================================================================
 # 参数定义区域
 # =============================================================================
@@ -73,7 +97,17 @@ ARGS_MAP = {
     "output_dir": {"flag": "--output-dir", "type": "str", "required": False, "help": "输出目录", "default": "./output"},
     
     # 列选择（可选）
-    "columns": {"flag": "--columns", "type": "str", "required": False, "help": "要分析的列，用逗号分隔"},
+    "columns": {"flag": "--columns", "type": "str", "required": False,
+                "help": "要分析的列，用逗号分隔（文件数据源只读取这些列；data_info 的 shape/columns/dtypes 也只描述这些列）"},
+    
+    # API数据缓存（默认关闭）
+    "cache_api": {"flag": "--cache-api", "type": "bool", "required": False,
+                  "help": "将API数据缓存为Parquet（遵循Cache-Control，过期后用ETag/Last-Modified条件请求）", "default": False},
+    
+    # 相关性计算精度（默认双精度；显式指定float32时，在校验误差可接受的情况下使用单精度矩阵乘法）
+    "analysis_precision": {"flag": "--analysis-precision", "type": "choice", "required": False,
+                          "help": "相关性计算精度（float32为可选的快速模式，仅按前若干行校验误差）",
+                          "choices": ["float32", "float64"], "default": "float64"},
     
     # 其他选项
     "verbose": {"flag": "--verbose", "type": "bool", "required": False, "help": "详细输出模式", "default": False},
@@ -106,12 +140,27 @@ def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[D
                 value=data_file
             ).to_dict()
         
-        if not os.path.exists(data_file):
+        # 一次stat同时确认存在性，不再先exists再打开
+        try:
+            os.stat(data_file)
+        except OSError:
             return False, ValidationError(
                 message="数据文件不存在",
                 parameter="data_file",
                 value=data_file
             ).to_dict()
+        
+        # 只读取这些列之前，先按文件表头确认列名存在
+        columns = parse_columns(params.get('columns', ''))
+        if columns:
+            file_columns = read_file_columns(data_file)
+            missing = [col for col in columns if col not in file_columns] if file_columns is not None else []
+            if missing:
+                return False, ValidationError(
+                    message=f"数据文件中不存在以下列: {', '.join(missing)}",
+                    parameter="columns",
+                    value=params.get('columns')
+                ).to_dict()
     
     elif data_source == "url":
         data_url = params.get('data_url')
@@ -131,39 +180,93 @@ def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[D
                 value=api_endpoint
             ).to_dict()
     
-    # 验证输出目录，不存在则创建
+    # 验证输出目录，不存在则创建（exist_ok 已涵盖目录存在的情况，无需预先检查）
     output_dir = params.get('output_dir', './output')
-    output_path = Path(output_dir)
-    if not output_path.exists():
-        try:
-            output_path.mkdir(parents=True, exist_ok=True)
-        except Exception as e:
-            return False, ValidationError(
-                message=f"无法创建输出目录: {str(e)}",
-                parameter="output_dir",
-                value=output_dir
-            ).to_dict()
+    try:
+        os.makedirs(output_dir, exist_ok=True)
+    except OSError as e:
+        return False, ValidationError(
+            message=f"无法创建输出目录: {str(e)}",
+            parameter="output_dir",
+            value=output_dir
+        ).to_dict()
     
     return True, None
 
 
-def load_data_from_file(file_path: str) -> Optional[pd.DataFrame]:
-    """从文件加载数据"""
+def parse_columns(columns_str: Optional[str]) -> Optional[List[str]]:
+    """解析逗号分隔的列名，未指定时返回None"""
+    if not columns_str:
+        return None
+    return [col.strip() for col in columns_str.split(',')]
+
+
+def read_file_columns(file_path: str) -> Optional[List[str]]:
+    """只读取文件表头返回列名，用于列下推前的校验；JSON等无法只读表头的格式或读取失败时返回None"""
+    load_analysis_modules()
+    extension = Path(file_path).suffix.lower()
+    try:
+        if extension in ['.xlsx', '.xls']:
+            return list(read_excel_file(file_path, nrows=0).columns)
+        elif extension == '.json':
+            return None
+        elif extension == '.parquet':
+            import pyarrow.parquet as pq
+            return pq.read_schema(file_path).names
+        else:
+            return list(pd.read_csv(file_path, nrows=0).columns)
+    except Exception:
+        return None
+
+
+def read_csv_file(file_path: str, columns: Optional[List[str]] = None) -> pd.DataFrame:
+    """读取CSV文件，优先使用pyarrow多线程解析并只解析需要的列"""
+    try:
+        import pyarrow.csv as pa_csv
+    except ImportError:
+        return pd.read_csv(file_path, usecols=columns)
+    
+    import pyarrow as pa
+    
+    convert_options = pa_csv.ConvertOptions(include_columns=columns) if columns else None
+    table = pa_csv.read_csv(file_path, convert_options=convert_options)
+    
+    # pyarrow 会自动推断日期列，转回文本以与 pd.read_csv 的结果保持一致
+    for i, field in enumerate(table.schema):
+        if pa.types.is_date(field.type) or pa.types.is_timestamp(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.string()))
+    # self_destruct + split_blocks：逐列转换并释放Arrow缓冲区，避免两份完整数据同时驻留内存
+    return table.to_pandas(self_destruct=True, split_blocks=True)
+
+
+def read_excel_file(file_path: str, columns: Optional[List[str]] = None, nrows: Optional[int] = None) -> pd.DataFrame:
+    """
+    读取Excel文件，优先使用基于Rust的calamine引擎（支持xlsx和xls），不可用时回退到pandas默认引擎
+    未安装python-calamine时抛出 ImportError；pandas < 2.2 不认识该引擎时抛出 ValueError
+    """
+    try:
+        return pd.read_excel(file_path, engine='calamine', usecols=columns, nrows=nrows)
+    except (ImportError, ValueError):
+        return pd.read_excel(file_path, usecols=columns, nrows=nrows)
+
+
+def load_data_from_file(file_path: str, columns: Optional[List[str]] = None) -> Optional[pd.DataFrame]:
+    """从文件加载数据，指定columns时只读取这些列"""
     path = Path(file_path)
     extension = path.suffix.lower()
     
     try:
         if extension == '.csv':
-            return pd.read_csv(file_path)
+            return read_csv_file(file_path, columns)
         elif extension in ['.xlsx', '.xls']:
-            return pd.read_excel(file_path)
+            return read_excel_file(file_path, columns)
         elif extension == '.json':
             return pd.read_json(file_path)
         elif extension == '.parquet':
-            return pd.read_parquet(file_path)
+            return pd.read_parquet(file_path, columns=columns)
         else:
             # 尝试以CSV格式读取
-            return pd.read_csv(file_path)
+            return read_csv_file(file_path, columns)
     except Exception as e:
         return None
 
@@ -181,87 +284,350 @@ def load_data_from_url(url: str) -> Optional[pd.DataFrame]:
         return None
 
 
-def load_data_from_api(api_endpoint: str) -> Optional[pd.DataFrame]:
-    """从API加载数据"""
+# 记录数达到该规模时通过Arrow列式构建DataFrame
+ARROW_RECORDS_MIN_ROWS = 10_000
+
+
+def records_to_dataframe(records: List[Any]) -> pd.DataFrame:
+    """将记录列表转换为DataFrame，大列表优先用pyarrow按列构建"""
+    if len(records) >= ARROW_RECORDS_MIN_ROWS:
+        try:
+            import pyarrow as pa
+            # pa.array 会合并所有记录的字段推断结构类型，不会丢弃只出现在后续记录中的列
+            return pa.Table.from_struct_array(pa.array(records)).to_pandas(self_destruct=True)
+        except Exception:
+            pass
+    return pd.DataFrame(records)
+
+
+def parse_json_bytes(content: bytes) -> Any:
+    """解析JSON响应体，优先使用orjson"""
+    try:
+        import orjson
+    except ImportError:
+        return json.loads(content)
+    return orjson.loads(content)
+
+
+def dataframe_from_payload(data: Any) -> Optional[pd.DataFrame]:
+    """将API返回的JSON数据转换为DataFrame"""
+    # 如果是字典，尝试找到数据列表
+    if isinstance(data, dict):
+        # 常见的API响应格式
+        for key in ['data', 'results', 'items', 'records']:
+            if key in data and isinstance(data[key], list):
+                return records_to_dataframe(data[key])
+        
+        # 如果没有找到列表，将整个字典转换为单行DataFrame
+        return pd.DataFrame([data])
+    elif isinstance(data, list):
+        return records_to_dataframe(data)
+    else:
+        return None
+
+
+def _api_cache_paths(cache_dir: str, api_endpoint: str) -> tuple[str, str]:
+    """返回API缓存的数据文件和元信息文件路径"""
+    # hashlib 会加载OpenSSL，只有API数据源才需要，不放在模块顶层
+    import hashlib
+    key = hashlib.sha1(api_endpoint.encode('utf-8')).hexdigest()
+    return os.path.join(cache_dir, f"{key}.parquet"), os.path.join(cache_dir, f"{key}.json")
+
+
+def _store_api_cache(df: pd.DataFrame, data_file: str, meta_file: str, meta: Dict[str, Any]) -> None:
+    """写入API缓存，写入失败（如列类型无法存为Parquet）时忽略"""
+    try:
+        os.makedirs(os.path.dirname(data_file), exist_ok=True)
+        df.to_parquet(data_file)
+        with open(meta_file, 'w', encoding='utf-8') as f:
+            json.dump(meta, f)
+    except Exception:
+        pass
+
+
+def _cache_max_age(cache_control: str) -> int:
+    """
+    按 Cache-Control 计算缓存可直接使用的秒数
+    no-cache 或未声明 max-age 时为0，即每次使用前都需要条件请求重新验证
+    """
+    if 'no-cache' in cache_control:
+        return 0
+    max_age = re.search(r'max-age=(\d+)', cache_control)
+    return int(max_age.group(1)) if max_age else 0
+
+
+def load_data_from_api(api_endpoint: str, cache_dir: Optional[str] = None) -> Optional[pd.DataFrame]:
+    """
+    从API加载数据
+    指定 cache_dir 时将解析后的数据缓存为Parquet：在响应头 max-age 有效期内直接读取本地缓存，
+    否则携带 ETag/Last-Modified 发起条件请求，304 时继续使用缓存；no-store 的响应不缓存
+    """
     try:
         import requests
-        response = requests.get(api_endpoint)
+        
+        data_file = meta_file = None
+        meta: Dict[str, Any] = {}
+        headers = {}
+        if cache_dir:
+            data_file, meta_file = _api_cache_paths(cache_dir, api_endpoint)
+            if os.path.exists(data_file) and os.path.exists(meta_file):
+                with open(meta_file, 'r', encoding='utf-8') as f:
+                    meta = json.load(f)
+                if time.time() - meta.get('stored_at', 0) < meta.get('max_age', 0):
+                    return pd.read_parquet(data_file)
+                if meta.get('etag'):
+                    headers['If-None-Match'] = meta['etag']
+                if meta.get('last_modified'):
+                    headers['If-Modified-Since'] = meta['last_modified']
+        
+        response = requests.get(api_endpoint, headers=headers)
+        if response.status_code == 304 and meta:
+            meta['stored_at'] = time.time()
+            if 'Cache-Control' in response.headers:
+                meta['max_age'] = _cache_max_age(response.headers['Cache-Control'].lower())
+            with open(meta_file, 'w', encoding='utf-8') as f:
+                json.dump(meta, f)
+            return pd.read_parquet(data_file)
         response.raise_for_status()
         
         # 尝试解析JSON响应
-        data = response.json()
+        df = dataframe_from_payload(parse_json_bytes(response.content))
         
-        # 如果是字典，尝试找到数据列表
-        if isinstance(data, dict):
-            # 常见的API响应格式
-            for key in ['data', 'results', 'items', 'records']:
-                if key in data and isinstance(data[key], list):
-                    return pd.DataFrame(data[key])
-            
-            # 如果没有找到列表，将整个字典转换为单行DataFrame
-            return pd.DataFrame([data])
-        elif isinstance(data, list):
-            return pd.DataFrame(data)
-        else:
-            return None
+        cache_control = response.headers.get('Cache-Control', '').lower()
+        if df is not None and cache_dir and 'no-store' not in cache_control:
+            max_age = _cache_max_age(cache_control)
+            etag = response.headers.get('ETag')
+            last_modified = response.headers.get('Last-Modified')
+            # 既不能直接复用又无法重新验证的响应没有缓存价值
+            if max_age or etag or last_modified:
+                _store_api_cache(df, data_file, meta_file, {
+                    "endpoint": api_endpoint,
+                    "etag": etag,
+                    "last_modified": last_modified,
+                    "max_age": max_age,
+                    "stored_at": time.time()
+                })
+        return df
     except Exception as e:
         return None
 
 
-def descriptive_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
-    """描述性统计分析"""
+def build_column_profile(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    一次性完成列筛选和按类型分组，供各项分析共用
+    数值列逐列取出为float64数组：本身是float64的列直接引用DataFrame数据（不复制），
+    只有其他数值类型的列才转换，避免整体复制出一份数值矩阵
+    """
     if columns:
         df = df[columns]
+    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
+    return {
+        "df": df,
+        "numeric_cols": numeric_cols,
+        "numeric_arrays": {col: df[col].to_numpy(dtype=np.float64, na_value=np.nan) for col in numeric_cols},
+        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "categorical_cols": df.select_dtypes(include=['object', 'category']).columns.tolist()
+    }
+
+
+def numeric_matrix(profile: Dict[str, Any], cols: Optional[List[str]] = None,
+                   rows: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    按需将数值列组装为列优先（Fortran序）的矩阵，只在确实需要整体矩阵运算时调用
+    传入 rows 时按该行序取值，cols 默认为全部数值列
+    """
+    arrays = profile["numeric_arrays"]
+    if cols is None:
+        cols = profile["numeric_cols"]
+    n = len(profile["df"]) if rows is None else len(rows)
+    matrix = np.empty((n, len(cols)), dtype=np.float64, order='F')
+    for idx, col in enumerate(cols):
+        matrix[:, idx] = arrays[col] if rows is None else arrays[col][rows]
+    return matrix
+
+
+def get_sorted_values(profile: Dict[str, Any], col: str, sorted_cache: Optional[Dict[str, np.ndarray]] = None) -> np.ndarray:
+    """
+    返回列中非空值排序后的数组
+    传入 sorted_cache 时同一列只排序一次，供描述性分析和分布分析共用
+    """
+    if sorted_cache is not None and col in sorted_cache:
+        return sorted_cache[col]
+    column = profile["numeric_arrays"][col]
+    values = np.sort(column[~np.isnan(column)])
+    if sorted_cache is not None:
+        sorted_cache[col] = values
+    return values
+
+
+# 列数和数据量都达到阈值时才用线程池并行排序，避免小数据上的线程开销
+PARALLEL_MIN_COLUMNS = 4
+PARALLEL_MIN_CELLS = 1_000_000
+
+
+def presort_columns(profile: Dict[str, Any], sorted_cache: Dict[str, np.ndarray]) -> None:
+    """
+    并行预先排序所有数值列并写入 sorted_cache
+    np.sort 执行时会释放GIL，多线程可按列并行且直接读取各列数组、无需复制
+    """
+    pending = [col for col in profile["numeric_cols"] if col not in sorted_cache]
+    workers = min(len(pending), os.cpu_count() or 1)
+    if workers < 2 or len(pending) < PARALLEL_MIN_COLUMNS or len(profile["df"]) * len(pending) < PARALLEL_MIN_CELLS:
+        return
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for col, values in zip(pending, executor.map(lambda c: get_sorted_values(profile, c), pending)):
+            sorted_cache[col] = values
+
+
+# 分布分析输出的分位点
+DISTRIBUTION_PERCENTILES = (("25%", 0.25), ("50%", 0.50), ("75%", 0.75), ("90%", 0.90), ("95%", 0.95))
+
+
+def percentiles_from_sorted(values: np.ndarray, qs: List[float]) -> List[float]:
+    """
+    在已排序数组上按线性插值一次取出多个分位数（与 pandas.quantile 默认行为一致）
+    所有分位点的下标和插值一次性向量化计算
+    """
+    n = len(values)
+    if n == 0:
+        return [float('nan')] * len(qs)
+    pos = np.asarray(qs, dtype=np.float64) * (n - 1)
+    lower = pos.astype(np.intp)
+    upper = np.minimum(lower + 1, n - 1)
+    return (values[lower] + (values[upper] - values[lower]) * (pos - lower)).tolist()
+
+
+def summarize_sorted(values: np.ndarray) -> Dict[str, float]:
+    """基于已排序数组生成与 DataFrame.describe() 相同字段的统计信息"""
+    n = len(values)
+    if n == 0:
+        nan = float('nan')
+        return {"count": 0.0, "mean": nan, "std": nan, "min": nan,
+                "25%": nan, "50%": nan, "75%": nan, "max": nan}
+    q25, q50, q75 = percentiles_from_sorted(values, [0.25, 0.50, 0.75])
+    return {
+        "count": float(n),
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if n > 1 else float('nan'),
+        "min": float(values[0]),
+        "25%": q25,
+        "50%": q50,
+        "75%": q75,
+        "max": float(values[-1])
+    }
+
+
+def top_k_counts(series: pd.Series, k: int) -> Dict[Any, int]:
+    """
+    返回出现次数最多的k个值及其次数，等价于 value_counts().head(k)
+    按哈希表计数（不对全部计数排序），再用 nlargest 只取前k个；次数相同时按首次出现的顺序排列
+    """
+    return series.value_counts(sort=False).nlargest(k, keep='first').to_dict()
+
+
+def descriptive_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                         sorted_cache: Optional[Dict[str, np.ndarray]] = None,
+                         profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """描述性统计分析"""
+    if profile is None:
+        profile = build_column_profile(df, columns)
+    df = profile["df"]
     
     result = {
         "shape": df.shape,
         "columns": list(df.columns),
-        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "dtypes": profile["dtypes"],
         "missing_values": df.isnull().sum().to_dict(),
         "numeric_summary": {},
         "categorical_summary": {}
     }
     
     # 数值型列的统计信息
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    if numeric_cols:
-        result["numeric_summary"] = df[numeric_cols].describe().to_dict()
+    if sorted_cache is None:
+        sorted_cache = {}
+    presort_columns(profile, sorted_cache)
+    for col in profile["numeric_cols"]:
+        result["numeric_summary"][col] = summarize_sorted(get_sorted_values(profile, col, sorted_cache))
     
     # 分类型列的统计信息
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    for col in categorical_cols:
+    for col in profile["categorical_cols"]:
         result["categorical_summary"][col] = {
             "unique_count": df[col].nunique(),
-            "top_values": df[col].value_counts().head(10).to_dict()
+            "top_values": top_k_counts(df[col], 10)
         }
     
     return result
 
 
-def correlation_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+def fast_corr(values: np.ndarray) -> np.ndarray:
+    """
+    用中心化矩阵的一次矩阵乘法（BLAS GEMM）计算皮尔逊相关系数矩阵
+    要求输入不含缺失值；常量列的相关系数为NaN，与 DataFrame.corr() 一致
+    """
+    n = values.shape[0]
+    centered = values - values.mean(axis=0)
+    std = centered.std(axis=0, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        corr = (centered.T @ centered) / ((n - 1) * np.outer(std, std))
+    np.fill_diagonal(corr, np.where(std > 0, 1.0, np.nan))
+    return np.clip(corr, -1.0, 1.0)
+
+
+# float32 校验样本的行数和允许的最大相关系数误差
+PRECISION_CALIBRATION_ROWS = 2048
+PRECISION_TOLERANCE = 1e-4
+
+
+def choose_corr_values(values: np.ndarray, precision: str = "float64") -> np.ndarray:
+    """
+    按请求的精度返回用于相关性计算的矩阵
+    float32 时先在前若干行上分别用单/双精度计算相关系数，误差超过阈值
+    （如量级很大而方差很小的列）或数值超出float32范围时回退到float64
+    """
+    if precision != "float32":
+        return values
+    with np.errstate(over='ignore'):
+        values32 = values.astype(np.float32)
+    if not np.isfinite(values32).all():
+        return values
+    sample = values[:PRECISION_CALIBRATION_ROWS]
+    if len(sample) > 1:
+        with np.errstate(invalid='ignore'):
+            drift = np.abs(fast_corr(sample.astype(np.float32)) - fast_corr(sample))
+        if np.nanmax(drift, initial=0.0) > PRECISION_TOLERANCE:
+            return values
+    return values32
+
+
+def correlation_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                         profile: Optional[Dict[str, Any]] = None,
+                         precision: str = "float64") -> Dict[str, Any]:
     """相关性分析"""
-    if columns:
-        df = df[columns]
+    if profile is None:
+        profile = build_column_profile(df, columns)
     
     # 只选择数值型列
-    numeric_df = df.select_dtypes(include=[np.number])
+    numeric_cols = profile["numeric_cols"]
+    values = numeric_matrix(profile)
     
-    if numeric_df.empty:
+    if values.size == 0:
         return {"error": "没有数值型列可用于相关性分析"}
     
-    correlation_matrix = numeric_df.corr()
-    
-    # 找出强相关关系（相关系数绝对值大于0.7）
-    strong_correlations = []
-    for i in range(len(correlation_matrix.columns)):
-        for j in range(i+1, len(correlation_matrix.columns)):
-            corr_value = correlation_matrix.iloc[i, j]
-            if abs(corr_value) > 0.7:
-                strong_correlations.append({
-                    "column1": correlation_matrix.columns[i],
-                    "column2": correlation_matrix.columns[j],
-                    "correlation": corr_value
-                })
+    # 无缺失值时走矩阵乘法快速路径，否则使用pandas的成对缺失值处理
+    if len(values) > 1 and not np.isnan(values).any():
+        corr = fast_corr(choose_corr_values(values, precision)).astype(np.float64)
+        correlation_matrix = pd.DataFrame(corr, index=numeric_cols, columns=numeric_cols)
+    else:
+        correlation_matrix = pd.DataFrame(values, columns=numeric_cols).corr()
+    
+    # 找出强相关关系（相关系数绝对值大于0.7），只看上三角避免重复
+    matrix = correlation_matrix.to_numpy()
+    rows, cols = np.nonzero(np.triu(np.abs(matrix) > 0.7, k=1))
+    column_names = correlation_matrix.columns
+    strong_correlations = [
+        {"column1": column_names[i], "column2": column_names[j], "correlation": value}
+        for i, j, value in zip(rows.tolist(), cols.tolist(), matrix[rows, cols].tolist())
+    ]
     
     return {
         "correlation_matrix": correlation_matrix.to_dict(),
@@ -269,88 +635,209 @@ def correlation_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None)
     }
 
 
-def distribution_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+# 数据量达到该规模时才使用numba内核（加载和JIT本身有固定开销）
+NUMBA_MIN_SIZE = 1_000_000
+_numba_moments_kernel = None
+
+
+def _build_numba_moments_kernel():
+    """编译numba并行列矩内核（结果缓存到磁盘），未安装numba时返回None"""
+    try:
+        from numba import njit, prange
+    except ImportError:
+        return None
+    
+    @njit(parallel=True, cache=True)
+    def kernel(values):
+        n, p = values.shape
+        out = np.empty((5, p))
+        for j in prange(p):
+            count = 0.0
+            total = 0.0
+            for i in range(n):
+                v = values[i, j]
+                if not np.isnan(v):
+                    count += 1.0
+                    total += v
+            mean = total / count if count > 0 else np.nan
+            m2 = 0.0
+            m3 = 0.0
+            m4 = 0.0
+            for i in range(n):
+                v = values[i, j]
+                if not np.isnan(v):
+                    d = v - mean
+                    d2 = d * d
+                    m2 += d2
+                    m3 += d2 * d
+                    m4 += d2 * d2
+            out[0, j] = count
+            out[1, j] = mean
+            out[2, j] = m2
+            out[3, j] = m3
+            out[4, j] = m4
+        return out
+    
+    return kernel
+
+
+def column_moments_numpy(values: np.ndarray) -> np.ndarray:
+    """numpy实现的列矩计算，忽略缺失值"""
+    valid = ~np.isnan(values)
+    count = valid.sum(axis=0).astype(np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        mean = np.where(valid, values, 0.0).sum(axis=0) / count
+    d = np.where(valid, values - mean, 0.0)
+    d2 = d * d
+    return np.vstack([count, mean, d2.sum(axis=0), (d2 * d).sum(axis=0), (d2 * d2).sum(axis=0)])
+
+
+def column_moments(values: np.ndarray, data_size: Optional[int] = None) -> np.ndarray:
+    """
+    一次计算每列的 [有效个数, 均值, 二阶/三阶/四阶中心矩之和]
+    大数据量且安装了numba时使用并行JIT内核，否则使用numpy
+    data_size 为用于选择实现的数据规模，逐列调用时传入整体规模，默认为 values.size
+    """
+    global _numba_moments_kernel
+    if (values.size if data_size is None else data_size) >= NUMBA_MIN_SIZE:
+        if _numba_moments_kernel is None:
+            _numba_moments_kernel = _build_numba_moments_kernel() or column_moments_numpy
+        return _numba_moments_kernel(values)
+    return column_moments_numpy(values)
+
+
+def _zero_out_fperr(arr: np.ndarray) -> np.ndarray:
+    """将浮点误差级别的微小值置零"""
+    return np.where(np.abs(arr) < 1e-14, 0.0, arr)
+
+
+def skew_kurtosis_from_moments(moments: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """由列矩计算偏度和峰度，采用与 pandas Series.skew()/kurtosis() 相同的无偏估计"""
+    count, _, m2, m3, m4 = moments
+    m2 = _zero_out_fperr(m2)
+    m3 = _zero_out_fperr(m3)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        skew = (count * (count - 1) ** 0.5 / (count - 2)) * (m3 / m2 ** 1.5)
+        numerator = _zero_out_fperr(count * (count + 1) * (count - 1) * m4)
+        denominator = _zero_out_fperr((count - 2) * (count - 3) * m2 ** 2)
+        kurt = numerator / denominator - 3 * (count - 1) ** 2 / ((count - 2) * (count - 3))
+    skew = np.where(m2 == 0, 0.0, skew)
+    skew[count < 3] = np.nan
+    kurt = np.where(denominator == 0, 0.0, kurt)
+    kurt[count < 4] = np.nan
+    return skew, kurt
+
+
+def distribution_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                          sorted_cache: Optional[Dict[str, np.ndarray]] = None,
+                          profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """分布分析"""
-    if columns:
-        df = df[columns]
+    if profile is None:
+        profile = build_column_profile(df, columns)
+    df = profile["df"]
     
     result = {}
     
     # 数值型列的分布分析
-    numeric_cols = df.select_dtypes(include=[np.number]).columns.tolist()
-    for col in numeric_cols:
-        col_data = df[col].dropna()
-        if len(col_data) > 0:
+    numeric_cols = profile["numeric_cols"]
+    if numeric_cols:
+        # 逐列计算列矩（单列视图无需复制），再一次性求出所有列的偏度和峰度
+        arrays = profile["numeric_arrays"]
+        data_size = len(df) * len(numeric_cols)
+        moments = np.hstack([column_moments(arrays[col].reshape(-1, 1), data_size) for col in numeric_cols])
+        skews, kurts = skew_kurtosis_from_moments(moments)
+    if sorted_cache is None:
+        sorted_cache = {}
+    presort_columns(profile, sorted_cache)
+    for idx, col in enumerate(numeric_cols):
+        if moments[0, idx] > 0:
+            sorted_values = get_sorted_values(profile, col, sorted_cache)
             result[col] = {
-                "skewness": float(col_data.skew()),
-                "kurtosis": float(col_data.kurtosis()),
-                "percentiles": {
-                    "25%": float(col_data.quantile(0.25)),
-                    "50%": float(col_data.quantile(0.50)),
-                    "75%": float(col_data.quantile(0.75)),
-                    "90%": float(col_data.quantile(0.90)),
-                    "95%": float(col_data.quantile(0.95))
-                }
+                "skewness": skews[idx],
+                "kurtosis": kurts[idx],
+                "percentiles": dict(zip(
+                    (label for label, _ in DISTRIBUTION_PERCENTILES),
+                    percentiles_from_sorted(sorted_values, [q for _, q in DISTRIBUTION_PERCENTILES])
+                ))
             }
     
     # 分类型列的分布分析
-    categorical_cols = df.select_dtypes(include=['object', 'category']).columns.tolist()
-    for col in categorical_cols:
-        value_counts = df[col].value_counts()
+    for col in profile["categorical_cols"]:
+        value_counts = top_k_counts(df[col], 20)
         result[col] = {
-            "value_counts": value_counts.head(20).to_dict(),
-            "distribution": (value_counts / len(df)).head(20).to_dict()
+            "value_counts": value_counts,
+            "distribution": {value: count / len(df) for value, count in value_counts.items()}
         }
     
     return result
 
 
-def trend_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dict[str, Any]:
+def linear_trend_slopes(values: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    对矩阵的每一列按行号做一次线性回归，一次性求出所有列的斜率
+    每列独立忽略缺失值，结果与逐列 np.polyfit(x, y, 1) 一致
+    返回 (斜率数组, 每列有效值个数)
+    """
+    valid = ~np.isnan(values)
+    filled = np.where(valid, values, 0.0)
+    weights = valid.astype(np.float64)
+    x = np.arange(values.shape[0], dtype=np.float64)
+    
+    counts = weights.sum(axis=0)
+    sum_x = x @ weights
+    sum_xx = (x * x) @ weights
+    sum_y = filled.sum(axis=0)
+    sum_xy = x @ filled
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slopes = (sum_xy - sum_x * sum_y / counts) / (sum_xx - sum_x * sum_x / counts)
+    return slopes, counts
+
+
+def trend_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None,
+                   profile: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """趋势分析"""
-    if columns:
-        df = df[columns]
+    if profile is None:
+        profile = build_column_profile(df, columns)
+    df = profile["df"]
     
-    # 尝试找到时间列
+    # 尝试找到时间列：已是datetime类型的列直接采用，文本列只抽样前几行试解析
     time_cols = []
-    for col in df.columns:
-        if df[col].dtype == 'datetime64[ns]':
+    for col, dtype in df.dtypes.items():
+        if pd.api.types.is_datetime64_any_dtype(dtype):
             time_cols.append(col)
-        else:
-            # 尝试解析为日期时间
-            try:
-                pd.to_datetime(df[col].head(100))
+        elif pd.api.types.is_object_dtype(dtype) or pd.api.types.is_string_dtype(dtype):
+            sample = df[col].iloc[:5]
+            parsed = pd.to_datetime(sample, errors='coerce')
+            if len(sample) > 0 and parsed.notna().mean() > 0.9:
                 time_cols.append(col)
-            except:
-                pass
     
     if not time_cols:
         return {"error": "没有找到时间列可用于趋势分析"}
     
     result = {"time_columns": time_cols}
     
+    # 各时间列只按其行序重排所需的数值列，不再复制整个DataFrame
+    all_numeric_cols = profile["numeric_cols"]
+    
     # 对每个时间列进行分析
     for time_col in time_cols:
         try:
-            # 确保时间列是datetime类型
-            df_time = df.copy()
-            df_time[time_col] = pd.to_datetime(df_time[time_col])
+            # 转换为datetime并只对时间列排序，得到行序（与 DataFrame.sort_values 相同）
+            timestamps = pd.to_datetime(df[time_col]).reset_index(drop=True)
+            order = timestamps.sort_values().index.to_numpy()
             
-            # 按时间排序
-            df_time = df_time.sort_values(time_col)
-            
-            # 只选择数值型列进行趋势分析
-            numeric_cols = df_time.select_dtypes(include=[np.number]).columns.tolist()
+            # 只选择数值型列进行趋势分析（时间列本身除外）
+            numeric_cols = [col for col in all_numeric_cols if col != time_col]
             
             if numeric_cols:
                 trend_data = {}
-                for col in numeric_cols:
-                    # 计算简单线性趋势
-                    x = np.arange(len(df_time))
-                    y = df_time[col].values
-                    if len(y) > 1 and not np.isnan(y).all():
-                        slope = np.polyfit(x[~np.isnan(y)], y[~np.isnan(y)], 1)[0]
+                # 所有数值列一次性计算简单线性趋势
+                values = numeric_matrix(profile, numeric_cols, order)
+                slopes, counts = linear_trend_slopes(values)
+                for col, slope, count in zip(numeric_cols, slopes.tolist(), counts.tolist()):
+                    if count >= 2:
                         trend_data[col] = {
-                            "slope": float(slope),
+                            "slope": slope,
                             "direction": "increasing" if slope > 0 else "decreasing" if slope < 0 else "stable"
                         }
                 
@@ -361,17 +848,25 @@ def trend_analysis(df: pd.DataFrame, columns: Optional[List[str]] = None) -> Dic
     return result
 
 
-def create_visualization(df: pd.DataFrame, chart_type: str, columns: Optional[List[str]] = None, output_dir: str = "./output") -> Optional[str]:
+# 散点图最多绘制的点数，超过时随机抽样
+SCATTER_MAX_POINTS = 20_000
+# 热力图逐格标注数值的最大列数
+HEATMAP_MAX_ANNOTATED = 20
+
+
+def create_visualization(df: pd.DataFrame, chart_type: str, columns: Optional[List[str]] = None, output_dir: str = "./output",
+                         profile: Optional[Dict[str, Any]] = None) -> Optional[str]:
     """创建可视化图表"""
-    if columns:
-        df = df[columns]
+    if profile is None:
+        profile = build_column_profile(df, columns)
     
     # 只选择数值型列
-    numeric_df = df.select_dtypes(include=[np.number])
+    numeric_df = profile["df"][profile["numeric_cols"]]
     
     if numeric_df.empty:
         return None
     
+    load_plotting_modules()
     plt.figure(figsize=(10, 6))
     
     try:
@@ -389,7 +884,13 @@ def create_visualization(df: pd.DataFrame, chart_type: str, columns: Optional[Li
             if len(numeric_df.columns) >= 2:
                 x_col = numeric_df.columns[0]
                 y_col = numeric_df.columns[1]
-                plt.scatter(numeric_df[x_col], numeric_df[y_col], alpha=0.7)
+                x_values = numeric_df[x_col].to_numpy()
+                y_values = numeric_df[y_col].to_numpy()
+                # 点数过多时抽样绘制，并将散点栅格化为一张位图
+                if len(x_values) > SCATTER_MAX_POINTS:
+                    idx = np.random.default_rng(0).choice(len(x_values), SCATTER_MAX_POINTS, replace=False)
+                    x_values, y_values = x_values[idx], y_values[idx]
+                plt.scatter(x_values, y_values, alpha=0.7, rasterized=True)
                 plt.title(f'{x_col} vs {y_col} 散点图')
                 plt.xlabel(x_col)
                 plt.ylabel(y_col)
@@ -416,7 +917,17 @@ def create_visualization(df: pd.DataFrame, chart_type: str, columns: Optional[Li
         elif chart_type == "heatmap":
             # 热力图
             corr_matrix = numeric_df.corr()
-            sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', center=0)
+            matrix = corr_matrix.to_numpy()
+            labels = corr_matrix.columns.tolist()
+            plt.imshow(matrix, cmap='coolwarm', vmin=-1, vmax=1, aspect='auto')
+            plt.colorbar()
+            plt.xticks(range(len(labels)), labels, rotation=45, ha='right')
+            plt.yticks(range(len(labels)), labels)
+            # 列数不多时才逐格标注数值
+            if len(labels) <= HEATMAP_MAX_ANNOTATED:
+                for i in range(len(labels)):
+                    for j in range(len(labels)):
+                        plt.text(j, i, f"{matrix[i, j]:.2f}", ha='center', va='center', fontsize=8)
             plt.title('相关性热力图')
         
         elif chart_type == "box":
@@ -440,24 +951,24 @@ def create_visualization(df: pd.DataFrame, chart_type: str, columns: Optional[Li
 
 def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
     """处理业务逻辑的核心函数"""
+    load_analysis_modules()
     data_source = params.get('data_source', 'file')
     analysis_type = params.get('analysis_type', 'descriptive')
     chart_type = params.get('chart_type', 'histogram')
     output_dir = params.get('output_dir', './output')
     columns_str = params.get('columns', '')
+    analysis_precision = params.get('analysis_precision', 'float64')
     verbose = params.get('verbose', False)
     debug = params.get('debug', False)
     
     # 解析列名
-    columns = None
-    if columns_str:
-        columns = [col.strip() for col in columns_str.split(',')]
+    columns = parse_columns(columns_str)
     
     # 加载数据
     df = None
     if data_source == "file":
         data_file = params.get('data_file')
-        df = load_data_from_file(data_file)
+        df = load_data_from_file(data_file, columns)
         data_source_info = {"type": "file", "path": data_file}
     elif data_source == "url":
         data_url = params.get('data_url')
@@ -465,7 +976,8 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
         data_source_info = {"type": "url", "url": data_url}
     elif data_source == "api":
         api_endpoint = params.get('api_endpoint')
-        df = load_data_from_api(api_endpoint)
+        cache_dir = os.path.join(output_dir, '.cache') if params.get('cache_api', False) else None
+        df = load_data_from_api(api_endpoint, cache_dir)
         data_source_info = {"type": "api", "endpoint": api_endpoint}
     
     if df is None:
@@ -475,11 +987,24 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
             "data_source": data_source_info
         }
     
-    # 基本数据信息
+    # URL/API数据源无法预先校验列名，加载后再确认
+    missing = [col for col in columns if col not in df.columns] if columns else []
+    if missing:
+        return {
+            "success": False,
+            "error": f"数据中不存在以下列: {', '.join(missing)}",
+            "data_source": data_source_info
+        }
+    
+    # 列筛选、类型分组和数值列只构建一次，各项分析共用
+    profile = build_column_profile(df, columns)
+    df = profile["df"]
+    
+    # 基本数据信息（指定columns时只描述这些列；样例数据只取前5行转换一次）
     data_info = {
         "shape": df.shape,
         "columns": list(df.columns),
-        "dtypes": {col: str(dtype) for col, dtype in df.dtypes.items()},
+        "dtypes": profile["dtypes"],
         "sample_data": df.head().to_dict()
     }
     
@@ -490,30 +1015,30 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
         "timestamp": datetime.now().isoformat()
     }
     
-    # 根据分析类型执行不同的分析
-    if analysis_type == "descriptive" or analysis_type == "all":
-        result_data["descriptive_analysis"] = descriptive_analysis(df, columns)
-        if verbose:
-            result_data["message"] = "描述性分析完成"
-    
-    if analysis_type == "correlation" or analysis_type == "all":
-        result_data["correlation_analysis"] = correlation_analysis(df, columns)
-        if verbose:
-            result_data["message"] = "相关性分析完成"
+    # 每列排序后的数值只计算一次，描述性分析和分布分析共用
+    sorted_cache: Dict[str, np.ndarray] = {}
     
-    if analysis_type == "distribution" or analysis_type == "all":
-        result_data["distribution_analysis"] = distribution_analysis(df, columns)
-        if verbose:
-            result_data["message"] = "分布分析完成"
-    
-    if analysis_type == "trend" or analysis_type == "all":
-        result_data["trend_analysis"] = trend_analysis(df, columns)
+    # 分析类型分派表：(结果字段, 完成提示, 分析函数)，只执行请求的分析
+    analyzers = {
+        "descriptive": ("descriptive_analysis", "描述性分析完成",
+                        lambda: descriptive_analysis(df, columns, sorted_cache, profile)),
+        "correlation": ("correlation_analysis", "相关性分析完成",
+                        lambda: correlation_analysis(df, columns, profile, analysis_precision)),
+        "distribution": ("distribution_analysis", "分布分析完成",
+                         lambda: distribution_analysis(df, columns, sorted_cache, profile)),
+        "trend": ("trend_analysis", "趋势分析完成",
+                  lambda: trend_analysis(df, columns, profile)),
+    }
+    selected = list(analyzers) if analysis_type == "all" else [analysis_type]
+    for name in selected:
+        result_key, message, analyze = analyzers[name]
+        result_data[result_key] = analyze()
         if verbose:
-            result_data["message"] = "趋势分析完成"
+            result_data["message"] = message
     
     # 创建可视化图表
     if chart_type != "none":
-        chart_file = create_visualization(df, chart_type, columns, output_dir)
+        chart_file = create_visualization(df, chart_type, columns, output_dir, profile)
         if chart_file:
             result_data["visualization"] = {
                 "chart_type": chart_type,
@@ -536,11 +1061,11 @@ def generate_output_file(params: Dict[str, Any], result_data: Dict[str, Any]) ->
     """生成输出文件（可选）"""
     output_dir = params.get('output_dir', './output')
     
-    # 生成分析结果文件
+    # 生成分析结果文件（orjson直接序列化为UTF-8字节，numpy标量无需预先转换）
     output_file = os.path.join(output_dir, 'analysis_result.json')
     try:
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(result_data, f, ensure_ascii=False, indent=2)
+        with open(output_file, 'wb') as f:
+            f.write(dump_json_bytes(result_data))
         return output_file
     except Exception as e:
         if params.get('debug', False):
@@ -595,16 +1120,20 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
     )
 
 
-# =============================================================================
-# 入口函数
-# =============================================================================
+_PARSER: Optional[argparse.ArgumentParser] = None
 
-def main():
-    """主函数 - 处理命令行参数并调用处理函数"""
-    # 1. 创建参数解析器
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    返回根据ARGS_MAP构建的命令行解析器
+    首次调用时构建并缓存，--_sys_get_schema 探测不会触发构建
+    """
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+    
     parser = argparse.ArgumentParser(description='数据分析脚本 - 支持数据分析和可视化')
     
-    # 2. 添加所有参数
     for key, cfg in ARGS_MAP.items():
         param_type = cfg.get("type", "str")
         required = cfg.get("required", False)
@@ -637,22 +1166,32 @@ def main():
                 default=default
             )
     
-    # 3. 处理特殊参数 --_sys_get_schema
+    _PARSER = parser
+    return parser
+
+
+# =============================================================================
+# 入口函数
+# =============================================================================
+
+def main():
+    """主函数 - 处理命令行参数并调用处理函数"""
+    # 处理特殊参数 --_sys_get_schema（在构建解析器之前直接返回）
     if len(sys.argv) > 1 and sys.argv[1] == "--_sys_get_schema":
         print(get_schema())
         sys.exit(0)
     
-    # 4. 解析命令行参数
-    args = parser.parse_args()
+    # 1. 解析命令行参数（解析器按ARGS_MAP只构建一次）
+    args = get_parser().parse_args()
     
-    # 5. 构建参数字典
+    # 2. 构建参数字典
     params = {}
     for key in ARGS_MAP.keys():
         value = getattr(args, key, None)
         if value is not None:
             params[key] = value
     
-    # 6. 处理请求并打印结果
+    # 3. 处理请求并打印结果
     result = process_request(params)
     print_json_response(result)
 
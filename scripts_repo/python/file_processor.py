@@ -11,15 +11,21 @@
 """
 
 import argparse
+import codecs
+import csv
 import json
+import mmap
 import sys
 import os
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
 import traceback
 import zipfile
 import shutil
+from functools import lru_cache
 from datetime import datetime
+from itertools import islice
+from xml.sax import saxutils
 
 # 添加项目根目录到Python路径，以便导入error_handler模块
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -31,11 +37,12 @@ from src.core.error_handler import (
     ResourceError, 
     ScriptError, 
     ErrorType,
-    validate_parameters,
     create_success_response,
     create_file_response,
-    print_json_response
+    print_json_response,
+    dump_json_bytes
 )
+from src.utils.fast_stat import fast_stat
 
 # =============================================================================
 # 参数定义区域
@@ -60,21 +67,159 @@ ARGS_MAP = {
     "compression_type": {"flag": "--compression-type", "type": "choice", "required": False, "help": "压缩类型", 
                         "choices": ["zip", "tar", "gzip"], "default": "zip"},
     
+    # 批量压缩的其他文件（当operation为compress且compression_type为zip时使用）
+    "input_files": {"flag": "--input-files", "type": "str", "required": False,
+                    "help": "与输入文件一起打包进同一个ZIP的其他文件路径，用逗号分隔"},
+    
+    # 快速压缩（当operation为compress时使用，以压缩率换速度）
+    "fast_compress": {"flag": "--fast-compress", "type": "bool", "required": False, "help": "使用最快的压缩级别", "default": False},
+    
     # 预览行数（当operation为preview时使用）
     "preview_lines": {"flag": "--preview-lines", "type": "int", "required": False, "help": "预览行数", "default": 10},
     
+    # 结果文件写入后是否刷盘（fdatasync），默认不刷盘
+    "durable": {"flag": "--durable", "type": "bool", "required": False, "help": "结果文件写入后同步到磁盘", "default": False},
+    
     # 其他选项
     "verbose": {"flag": "--verbose", "type": "bool", "required": False, "help": "详细输出模式", "default": False},
     "debug": {"flag": "--debug", "type": "bool", "required": False, "help": "调试模式", "default": False},
 }
 
+# 按扩展名判断文件类型（集合常量只构建一次，O(1)成员判断）
+TEXT_EXTENSIONS = frozenset({'.txt', '.json', '.csv', '.xml', '.html', '.htm', '.py', '.js', '.css', '.md'})
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'})
+ARCHIVE_EXTENSIONS = frozenset({'.zip', '.tar', '.gz', '.rar', '.7z'})
+# 已压缩格式，再做DEFLATE几乎不会变小，打包时直接存储
+INCOMPRESSIBLE_EXTENSIONS = frozenset({'.gz', '.zip', '.7z', '.rar', '.xz', '.bz2', '.jpg', '.jpeg', '.png',
+                                       '.webp', '.mp3', '.mp4', '.mkv', '.avi', '.pdf'})
+
 # =============================================================================
 # 辅助函数区域
 # =============================================================================
 
+_SCHEMA_JSON: Optional[str] = None
+
+
 def get_schema() -> str:
-    """返回参数定义的JSON格式字符串"""
-    return json.dumps(ARGS_MAP, ensure_ascii=False)
+    """返回参数定义的JSON格式字符串（ARGS_MAP不变，序列化结果只生成一次）"""
+    global _SCHEMA_JSON
+    if _SCHEMA_JSON is None:
+        _SCHEMA_JSON = json.dumps(ARGS_MAP, ensure_ascii=False)
+    return _SCHEMA_JSON
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in ('true', '1', 'yes', 'on')
+    return bool(value)
+
+
+# 各参数类型的转换函数，file/str/choice 保持原值
+_CASTERS = {"int": int, "float": float, "bool": _to_bool}
+
+
+def _compile_validators(args_map: Dict[str, Any]) -> tuple:
+    """把参数定义预编译为 (名称, 类型, 是否必需, 转换函数, 可选值集合) 元组，校验时无需再查ARGS_MAP"""
+    validators = []
+    for name, meta in args_map.items():
+        param_type = meta.get("type", "str")
+        choices = meta.get("choices")
+        validators.append((
+            name,
+            param_type,
+            meta.get("required", False),
+            _CASTERS.get(param_type),
+            frozenset(choices) if choices else None,
+        ))
+    return tuple(validators)
+
+
+_VALIDATORS = _compile_validators(ARGS_MAP)
+
+
+class _InputSource:
+    """
+    验证阶段打开的输入文件：只读描述符及其fstat结果
+    后续操作复用该描述符，不再按路径重新打开；通过 with 保证关闭
+    """
+    
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.fd: Optional[int] = os.open(path, os.O_RDONLY | getattr(os, 'O_CLOEXEC', 0))
+        try:
+            self.stat = os.fstat(self.fd)
+        except OSError:
+            self.close()
+            raise
+    
+    def close(self) -> None:
+        """关闭描述符（可重复调用）"""
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+    
+    def __enter__(self) -> "_InputSource":
+        return self
+    
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def open_input_source(input_file: str) -> tuple[Optional[_InputSource], Optional[Dict[str, Any]]]:
+    """只打开一次输入文件，同时确认存在性和读权限；失败时返回验证错误"""
+    try:
+        return _InputSource(input_file), None
+    except FileNotFoundError:
+        return None, ValidationError(
+            message="输入文件不存在",
+            parameter="input_file",
+            value=input_file
+        ).to_dict()
+    except OSError as e:
+        return None, ValidationError(
+            message=f"无法读取输入文件: {e.strerror}",
+            parameter="input_file",
+            value=input_file
+        ).to_dict()
+
+
+def _validate_fast(params: Dict[str, Any]) -> tuple[Optional[_InputSource], Optional[Dict[str, Any]]]:
+    """
+    参数验证：按预编译的校验表一次遍历完成必需项、类型转换和可选值检查，
+    随后进行自定义验证并打开输入文件
+    验证通过时返回已打开的输入文件（由调用方用 with 关闭），否则返回 (None, 错误字典)
+    """
+    for name, param_type, required, caster, choices in _VALIDATORS:
+        value = params.get(name)
+        if value is None or value == '':
+            if required:
+                return None, ValidationError(
+                    message=f"缺少必需参数: {name}",
+                    parameter=name
+                ).to_dict()
+            continue
+        
+        if caster is not None:
+            try:
+                value = params[name] = caster(value)
+            except ValueError:
+                return None, ValidationError(
+                    message=f"参数 {name} 类型错误，期望 {param_type}",
+                    parameter=name,
+                    value=value
+                ).to_dict()
+        
+        if choices is not None and value not in choices:
+            return None, ValidationError(
+                message=f"参数 {name} 取值无效，可选值: {', '.join(sorted(choices))}",
+                parameter=name,
+                value=value
+            ).to_dict()
+    
+    is_valid, error_result = validate_custom_parameters(params)
+    if not is_valid:
+        return None, error_result
+    return open_input_source(params['input_file'])
 
 
 def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[Dict[str, Any]]]:
@@ -90,12 +235,18 @@ def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[D
             value=input_file
         ).to_dict()
     
-    if not os.path.exists(input_file):
-        return False, ValidationError(
-            message="输入文件不存在",
-            parameter="input_file",
-            value=input_file
-        ).to_dict()
+    # 批量压缩的其他文件：命令行传入逗号分隔的路径，解析为列表
+    input_files = params.get('input_files')
+    if input_files:
+        if isinstance(input_files, str):
+            input_files = params['input_files'] = [p.strip() for p in input_files.split(',') if p.strip()]
+        for file_path in input_files:
+            if not os.path.isfile(file_path):
+                return False, ValidationError(
+                    message="输入文件不存在",
+                    parameter="input_files",
+                    value=file_path
+                ).to_dict()
     
     # 验证输出目录，不存在则创建
     output_dir = params.get('output_dir', './output')
@@ -122,45 +273,156 @@ def validate_custom_parameters(params: Dict[str, Any]) -> tuple[bool, Optional[D
     return True, None
 
 
-def get_file_info(file_path: str) -> Dict[str, Any]:
-    """获取文件详细信息"""
+def get_file_info(file_path: str, stat_result: Optional[os.stat_result] = None) -> Dict[str, Any]:
+    """
+    获取文件详细信息
+    已有该文件的 stat 结果时可通过 stat_result 传入，避免重复的stat系统调用
+    """
     path = Path(file_path)
-    stat = path.stat()
+    stat = stat_result if stat_result is not None else fast_stat(file_path)
+    extension = _file_extension(file_path)
+    # 新写入的文件 ctime 与 mtime 通常相同，此时只格式化一次
+    modified_time = datetime.fromtimestamp(stat.st_mtime).isoformat()
+    if stat.st_ctime == stat.st_mtime:
+        created_time = modified_time
+    else:
+        created_time = datetime.fromtimestamp(stat.st_ctime).isoformat()
     
     return {
         "name": path.name,
         "size": stat.st_size,
         "size_human": _format_size(stat.st_size),
-        "extension": path.suffix.lower(),
+        "extension": extension,
         "absolute_path": str(path.absolute()),
-        "created_time": datetime.fromtimestamp(stat.st_ctime).isoformat(),
-        "modified_time": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-        "is_text": _is_text_file(path),
-        "is_image": path.suffix.lower() in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp'],
-        "is_archive": path.suffix.lower() in ['.zip', '.tar', '.gz', '.rar', '.7z']
+        "created_time": created_time,
+        "modified_time": modified_time,
+        "is_text": extension in TEXT_EXTENSIONS,
+        "is_image": extension in IMAGE_EXTENSIONS,
+        "is_archive": extension in ARCHIVE_EXTENSIONS
     }
 
 
+_SIZE_UNITS = ('B', 'KB', 'MB', 'GB')
+
+
 def _format_size(size_bytes: int) -> str:
-    """格式化文件大小为人类可读格式"""
-    if size_bytes < 1024:
+    """格式化文件大小为人类可读格式（由二进制位数直接算出单位，最大到GB）"""
+    unit = min(3, max(0, (size_bytes.bit_length() - 1) // 10))
+    if unit == 0:
         return f"{size_bytes} B"
-    elif size_bytes < 1024 * 1024:
-        return f"{size_bytes / 1024:.2f} KB"
-    elif size_bytes < 1024 * 1024 * 1024:
-        return f"{size_bytes / (1024 * 1024):.2f} MB"
-    else:
-        return f"{size_bytes / (1024 * 1024 * 1024):.2f} GB"
+    return f"{size_bytes / (1 << (10 * unit)):.2f} {_SIZE_UNITS[unit]}"
+
 
+@lru_cache(maxsize=256)
+def _file_extension(file_path: str) -> str:
+    """返回小写的文件扩展名；同一请求内多次判断同一路径时只解析一次"""
+    return Path(file_path).suffix.lower()
 
-def _is_text_file(path: Path) -> bool:
+
+def _is_text_file(path: Union[str, Path]) -> bool:
     """判断是否为文本文件"""
-    text_extensions = ['.txt', '.json', '.csv', '.xml', '.html', '.htm', '.py', '.js', '.css', '.md']
-    return path.suffix.lower() in text_extensions
+    return _file_extension(str(path)) in TEXT_EXTENSIONS
 
 
-def preview_file(file_path: str, lines: int = 10) -> Dict[str, Any]:
-    """预览文件内容"""
+# 预览时用于判断编码的文件头字节数
+ENCODING_SNIFF_BYTES = 4096
+
+
+def _open_input(file_path: str, fd: Optional[int], mode: str, **kwargs):
+    """
+    打开输入文件：已持有描述符时复制一份并从头读取（复制的描述符共享偏移量），不再按路径重新打开
+    返回的文件对象关闭时只关闭复制出的描述符
+    """
+    if fd is None:
+        return open(file_path, mode, **kwargs)
+    dup_fd = os.dup(fd)
+    try:
+        os.lseek(dup_fd, 0, os.SEEK_SET)
+        return os.fdopen(dup_fd, mode, **kwargs)
+    except Exception:
+        os.close(dup_fd)
+        raise
+
+
+def _sniff_encoding(file_path: str, fd: Optional[int] = None) -> str:
+    """读取文件头判断编码：能按UTF-8解码则为utf-8，否则按gbk处理"""
+    with _open_input(file_path, fd, 'rb') as f:
+        head = f.read(ENCODING_SNIFF_BYTES)
+    try:
+        # 增量解码器允许末尾出现被截断的多字节字符
+        codecs.getincrementaldecoder('utf-8')().decode(head, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "gbk"
+
+
+# 超过该大小的文本文件通过mmap定位预览范围、按字节统计行数
+MMAP_PREVIEW_MIN_SIZE = 1024 * 1024
+# 统计行数时每次扫描的字节数
+_LINE_COUNT_CHUNK = 8 * 1024 * 1024
+
+
+def _read_preview_mmap(file_path: str, encoding: str, lines: int,
+                       fd: Optional[int] = None) -> Optional[Dict[str, Any]]:
+    """
+    通过mmap只解码前 lines 行对应的字节，总行数用 bytes.count 按块统计（C实现的memchr），无需解码全文件
+    文件含 \r 时返回None，由文本模式处理通用换行符
+    """
+    with _open_input(file_path, fd, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        size = len(mm)
+        end = 0
+        preview_count = 0
+        while preview_count < lines and end < size:
+            nxt = mm.find(b'\n', end)
+            end = size if nxt < 0 else nxt + 1
+            preview_count += 1
+        data = mm[:end]
+        if b'\r' in data:
+            return None
+        
+        newlines = 0
+        for offset in range(0, size, _LINE_COUNT_CHUNK):
+            chunk = mm[offset:offset + _LINE_COUNT_CHUNK]
+            if b'\r' in chunk:
+                return None
+            newlines += chunk.count(b'\n')
+        # 末行没有换行符时也算一行
+        total_lines = newlines + (1 if size and mm[size - 1] != ord('\n') else 0)
+    
+    return {
+        "total_lines": total_lines,
+        "preview_lines": preview_count,
+        "content": data.decode(encoding),
+        "encoding": encoding
+    }
+
+
+def _read_preview(file_path: str, encoding: str, lines: int,
+                  fd: Optional[int] = None) -> Dict[str, Any]:
+    """按指定编码读取前 lines 行，其余内容只逐行遍历统计总行数，不保留在内存中"""
+    size = os.fstat(fd).st_size if fd is not None else os.path.getsize(file_path)
+    if size > MMAP_PREVIEW_MIN_SIZE:
+        result = _read_preview_mmap(file_path, encoding, lines, fd)
+        if result is not None:
+            return result
+    with _open_input(file_path, fd, 'r', encoding=encoding, buffering=64 * 1024) as f:
+        preview_lines = list(islice(f, lines))
+        total_lines = len(preview_lines) + sum(1 for _ in f)
+    return {
+        "total_lines": total_lines,
+        "preview_lines": len(preview_lines),
+        "content": ''.join(preview_lines),
+        "encoding": encoding
+    }
+
+
+def preview_file(file_path: str, lines: int = 10,
+                 fd: Optional[int] = None) -> Dict[str, Any]:
+    """
+    预览文件内容
+    只保留需要预览的行，不再把整个文件读入内存；大文件的总行数通过mmap按字节统计换行符
+    已打开该文件时可通过 fd 传入描述符，避免按路径重新打开
+    """
     path = Path(file_path)
     
     if not _is_text_file(path):
@@ -170,30 +432,15 @@ def preview_file(file_path: str, lines: int = 10) -> Dict[str, Any]:
         }
     
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content_lines = f.readlines()
-            total_lines = len(content_lines)
-            preview_lines = content_lines[:lines]
-            
-            return {
-                "total_lines": total_lines,
-                "preview_lines": len(preview_lines),
-                "content": ''.join(preview_lines),
-                "encoding": "utf-8"
-            }
-    except UnicodeDecodeError:
+        encoding = _sniff_encoding(file_path, fd)
+        if encoding == "utf-8":
+            try:
+                return _read_preview(file_path, "utf-8", lines, fd)
+            except UnicodeDecodeError:
+                # 文件头之后出现非UTF-8内容
+                encoding = "gbk"
         try:
-            with open(file_path, 'r', encoding='gbk') as f:
-                content_lines = f.readlines()
-                total_lines = len(content_lines)
-                preview_lines = content_lines[:lines]
-                
-                return {
-                    "total_lines": total_lines,
-                    "preview_lines": len(preview_lines),
-                    "content": ''.join(preview_lines),
-                    "encoding": "gbk"
-                }
+            return _read_preview(file_path, encoding, lines, fd)
         except Exception as e:
             return {
                 "error": f"无法读取文件内容: {str(e)}",
@@ -206,6 +453,43 @@ def preview_file(file_path: str, lines: int = 10) -> Dict[str, Any]:
         }
 
 
+# 内核态复制时每次系统调用请求的最大字节数
+_COPY_CHUNK = 1 << 30
+
+
+def _fast_copy(src: str, dst: str) -> None:
+    """
+    复制文件内容，优先在内核内完成：copy_file_range → sendfile → 用户态 copyfileobj
+    两种内核调用都会推进文件偏移，中途失败时后续方式从当前位置继续复制
+    """
+    cloexec = getattr(os, 'O_CLOEXEC', 0)
+    src_fd = os.open(src, os.O_RDONLY | cloexec)
+    try:
+        dst_fd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | cloexec, 0o666)
+        try:
+            if hasattr(os, 'copy_file_range'):
+                try:
+                    while os.copy_file_range(src_fd, dst_fd, _COPY_CHUNK):
+                        pass
+                    return
+                except OSError:
+                    # 跨文件系统、内核不支持等情况下换下一种方式
+                    pass
+            if hasattr(os, 'sendfile'):
+                try:
+                    while os.sendfile(dst_fd, src_fd, None, _COPY_CHUNK):
+                        pass
+                    return
+                except OSError:
+                    pass
+            with open(src_fd, 'rb', closefd=False) as fsrc, open(dst_fd, 'wb', closefd=False) as fdst:
+                shutil.copyfileobj(fsrc, fdst)
+        finally:
+            os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+
+
 def convert_file(file_path: str, target_format: str, output_dir: str) -> Optional[str]:
     """转换文件格式"""
     path = Path(file_path)
@@ -215,44 +499,58 @@ def convert_file(file_path: str, target_format: str, output_dir: str) -> Optiona
         if target_format == "txt":
             # 转换为纯文本
             if _is_text_file(path):
-                shutil.copy2(file_path, output_file)
+                _fast_copy(file_path, output_file)
+                # 与 copy2 一样保留权限和时间戳
+                shutil.copystat(file_path, output_file)
             else:
                 return None
         elif target_format == "json":
             # 转换为JSON格式
             file_info = get_file_info(file_path)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(file_info, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'wb') as f:
+                f.write(dump_json_bytes(file_info))
         elif target_format == "csv":
             # 转换为CSV格式
             file_info = get_file_info(file_path)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write("属性,值\n")
-                for key, value in file_info.items():
-                    f.write(f"{key},{value}\n")
+            # csv.writer 会对含逗号、引号、换行的值加引号转义
+            with open(output_file, 'w', encoding='utf-8', newline='', buffering=64 * 1024) as f:
+                writer = csv.writer(f, lineterminator='\n')
+                writer.writerow(('属性', '值'))
+                writer.writerows(file_info.items())
         elif target_format == "xml":
             # 转换为XML格式
             file_info = get_file_info(file_path)
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write('<?xml version="1.0" encoding="UTF-8"?>\n')
-                f.write('<file>\n')
-                for key, value in file_info.items():
-                    f.write(f'  <{key}>{value}</{key}>\n')
-                f.write('</file>\n')
+            # 值做XML转义，整个文档拼接后一次写入
+            parts = ['<?xml version="1.0" encoding="UTF-8"?>', '<file>']
+            parts.extend(f'  <{key}>{saxutils.escape(str(value))}</{key}>' for key, value in file_info.items())
+            parts.append('</file>\n')
+            with open(output_file, 'wb') as f:
+                f.write('\n'.join(parts).encode('utf-8'))
         
         return output_file
     except Exception as e:
         return None
 
 
-def compress_file(file_path: str, compression_type: str, output_dir: str) -> Optional[str]:
-    """压缩文件"""
+def _zip_method(file_path: str, fast: bool) -> Tuple[int, Optional[int]]:
+    """ZIP条目的压缩方式和级别：已压缩格式直接存储（ZIP_STORED）；fast 为真时DEFLATE使用最快的级别1"""
+    if _file_extension(file_path) in INCOMPRESSIBLE_EXTENSIONS:
+        return zipfile.ZIP_STORED, None
+    return zipfile.ZIP_DEFLATED, (1 if fast else None)
+
+
+def compress_file(file_path: str, compression_type: str, output_dir: str, fast: bool = False) -> Optional[str]:
+    """
+    压缩文件
+    已压缩格式的输入直接存储（ZIP_STORED）；fast 为真时DEFLATE使用最快的级别1
+    """
     path = Path(file_path)
     
     if compression_type == "zip":
         output_file = os.path.join(output_dir, f"{path.stem}.zip")
+        method, level = _zip_method(file_path, fast)
         try:
-            with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            with zipfile.ZipFile(output_file, 'w', method, compresslevel=level) as zipf:
                 zipf.write(file_path, path.name)
             return output_file
         except Exception as e:
@@ -262,11 +560,39 @@ def compress_file(file_path: str, compression_type: str, output_dir: str) -> Opt
         return None
 
 
+def _zip_arcnames(file_paths: List[str]) -> Dict[str, str]:
+    """
+    为每个文件生成ZIP条目名：取相对于所有文件公共目录的路径，不同目录下的同名文件不会互相覆盖
+    同一文件重复出现时只保留一次
+    """
+    abs_paths = list(dict.fromkeys(os.path.abspath(p) for p in file_paths))
+    if len(abs_paths) == 1:
+        return {abs_paths[0]: os.path.basename(abs_paths[0])}
+    base = os.path.commonpath([os.path.dirname(p) for p in abs_paths])
+    return {p: os.path.relpath(p, base).replace(os.sep, '/') for p in abs_paths}
+
+
+def compress_files(file_paths: List[str], output_zip: str, fast: bool = False) -> Optional[str]:
+    """
+    将多个文件写入同一个ZIP（只打开一次、只写一次中央目录）
+    条目名为相对公共目录的路径；压缩方式与 compress_file 相同；早于1980年的时间戳按1980年记录而不报错
+    """
+    try:
+        with zipfile.ZipFile(output_zip, 'w', zipfile.ZIP_DEFLATED,
+                             allowZip64=True, strict_timestamps=False) as zipf:
+            for file_path, arcname in _zip_arcnames(file_paths).items():
+                method, level = _zip_method(file_path, fast)
+                zipf.write(file_path, arcname, compress_type=method, compresslevel=level)
+        return output_zip
+    except Exception as e:
+        return None
+
+
 def extract_file(file_path: str, output_dir: str) -> Optional[str]:
     """解压文件"""
     path = Path(file_path)
     
-    if path.suffix.lower() == '.zip':
+    if _file_extension(file_path) == '.zip':
         extract_dir = os.path.join(output_dir, path.stem)
         try:
             with zipfile.ZipFile(file_path, 'r') as zipf:
@@ -279,112 +605,167 @@ def extract_file(file_path: str, output_dir: str) -> Optional[str]:
         return None
 
 
-def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
-    """处理业务逻辑的核心函数"""
-    input_file = params.get('input_file')
+def _walk_files(root: str) -> Iterator[os.DirEntry]:
+    """
+    基于 os.scandir 遍历目录树，按 os.walk 的顺序逐个返回文件的 DirEntry
+    目录判断使用readdir返回的类型信息；DirEntry.stat() 会缓存结果，在Windows上无需额外系统调用
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir():
+                    # 与 os.walk 一致：指向目录的符号链接不展开
+                    if not entry.is_symlink():
+                        subdirs.append(entry.path)
+                else:
+                    yield entry
+        stack.extend(reversed(subdirs))
+
+
+def _op_info(params: Dict[str, Any], result_data: Dict[str, Any], source: _InputSource) -> Dict[str, Any]:
+    """只返回文件信息"""
+    if params.get('verbose', False):
+        result_data["message"] = "文件信息获取成功"
+    return result_data
+
+
+def _op_preview(params: Dict[str, Any], result_data: Dict[str, Any], source: _InputSource) -> Dict[str, Any]:
+    """预览文件内容"""
+    preview_lines = params.get('preview_lines', 10)
+    result_data["preview"] = preview_file(params['input_file'], preview_lines, source.fd)
+    if params.get('verbose', False):
+        result_data["message"] = f"文件预览成功，显示前{preview_lines}行"
+    return result_data
+
+
+def _op_convert(params: Dict[str, Any], result_data: Dict[str, Any], source: _InputSource) -> Dict[str, Any]:
+    """转换文件格式"""
+    target_format = params.get('target_format', 'txt')
+    output_file = convert_file(params['input_file'], target_format, params.get('output_dir', './output'))
+    
+    if output_file:
+        result_data["conversion"] = {
+            "success": True,
+            "target_format": target_format,
+            "output_file": output_file,
+            "output_file_info": get_file_info(output_file)
+        }
+        if params.get('verbose', False):
+            result_data["message"] = f"文件已转换为{target_format}格式"
+    else:
+        result_data["conversion"] = {
+            "success": False,
+            "target_format": target_format,
+            "error": "文件转换失败"
+        }
+    return result_data
+
+
+def _op_compress(params: Dict[str, Any], result_data: Dict[str, Any], source: _InputSource) -> Dict[str, Any]:
+    """压缩文件；指定 input_files 时将输入文件和这些文件打包进同一个ZIP"""
+    compression_type = params.get('compression_type', 'zip')
     output_dir = params.get('output_dir', './output')
+    input_files = params.get('input_files')
+    fast = params.get('fast_compress', False)
+    if input_files and compression_type == "zip":
+        output_zip = os.path.join(output_dir, f"{Path(params['input_file']).stem}.zip")
+        output_file = compress_files([params['input_file']] + input_files, output_zip, fast)
+    else:
+        output_file = compress_file(params['input_file'], compression_type, output_dir, fast)
+    
+    if output_file:
+        result_data["compression"] = {
+            "success": True,
+            "compression_type": compression_type,
+            "output_file": output_file,
+            "output_file_info": get_file_info(output_file)
+        }
+        if params.get('verbose', False):
+            result_data["message"] = f"文件已压缩为{compression_type}格式"
+    else:
+        result_data["compression"] = {
+            "success": False,
+            "compression_type": compression_type,
+            "error": "文件压缩失败"
+        }
+    return result_data
+
+
+def _op_extract(params: Dict[str, Any], result_data: Dict[str, Any], source: _InputSource) -> Dict[str, Any]:
+    """解压文件"""
+    extract_dir = extract_file(params['input_file'], params.get('output_dir', './output'))
+    
+    if extract_dir:
+        result_data["extraction"] = {
+            "success": True,
+            "extract_dir": extract_dir,
+            "extracted_files": []
+        }
+        
+        # 列出解压后的文件
+        try:
+            for entry in _walk_files(extract_dir):
+                result_data["extraction"]["extracted_files"].append({
+                    "name": entry.name,
+                    "path": entry.path,
+                    "size": entry.stat().st_size
+                })
+        except Exception as e:
+            if params.get('debug', False):
+                result_data["extraction"]["list_error"] = str(e)
+        
+        if params.get('verbose', False):
+            result_data["message"] = f"文件已解压到{extract_dir}"
+    else:
+        result_data["extraction"] = {
+            "success": False,
+            "error": "文件解压失败"
+        }
+    return result_data
+
+
+# 操作类型分派表，未知操作按 info 处理
+_OP_HANDLERS = {
+    "info": _op_info,
+    "preview": _op_preview,
+    "convert": _op_convert,
+    "compress": _op_compress,
+    "extract": _op_extract,
+}
+
+
+def process_business_logic(params: Dict[str, Any], source: _InputSource) -> Dict[str, Any]:
+    """处理业务逻辑的核心函数：获取文件基本信息后按操作类型分派（source 为验证阶段打开的输入文件）"""
     operation = params.get('operation', 'info')
-    verbose = params.get('verbose', False)
-    debug = params.get('debug', False)
     
     # 获取文件基本信息
-    file_info = get_file_info(input_file)
     result_data = {
-        "file_info": file_info,
+        "file_info": get_file_info(params['input_file'], source.stat),
         "operation": operation,
         "timestamp": datetime.now().isoformat()
     }
     
-    # 根据操作类型执行不同的处理
-    if operation == "info":
-        # 只返回文件信息
-        if verbose:
-            result_data["message"] = "文件信息获取成功"
-    
-    elif operation == "preview":
-        # 预览文件内容
-        preview_lines = params.get('preview_lines', 10)
-        preview_data = preview_file(input_file, preview_lines)
-        result_data["preview"] = preview_data
-        if verbose:
-            result_data["message"] = f"文件预览成功，显示前{preview_lines}行"
-    
-    elif operation == "convert":
-        # 转换文件格式
-        target_format = params.get('target_format', 'txt')
-        output_file = convert_file(input_file, target_format, output_dir)
-        
-        if output_file:
-            result_data["conversion"] = {
-                "success": True,
-                "target_format": target_format,
-                "output_file": output_file,
-                "output_file_info": get_file_info(output_file)
-            }
-            if verbose:
-                result_data["message"] = f"文件已转换为{target_format}格式"
-        else:
-            result_data["conversion"] = {
-                "success": False,
-                "target_format": target_format,
-                "error": "文件转换失败"
-            }
-    
-    elif operation == "compress":
-        # 压缩文件
-        compression_type = params.get('compression_type', 'zip')
-        output_file = compress_file(input_file, compression_type, output_dir)
-        
-        if output_file:
-            result_data["compression"] = {
-                "success": True,
-                "compression_type": compression_type,
-                "output_file": output_file,
-                "output_file_info": get_file_info(output_file)
-            }
-            if verbose:
-                result_data["message"] = f"文件已压缩为{compression_type}格式"
-        else:
-            result_data["compression"] = {
-                "success": False,
-                "compression_type": compression_type,
-                "error": "文件压缩失败"
-            }
-    
-    elif operation == "extract":
-        # 解压文件
-        extract_dir = extract_file(input_file, output_dir)
-        
-        if extract_dir:
-            result_data["extraction"] = {
-                "success": True,
-                "extract_dir": extract_dir,
-                "extracted_files": []
-            }
-            
-            # 列出解压后的文件
-            try:
-                for root, dirs, files in os.walk(extract_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        result_data["extraction"]["extracted_files"].append({
-                            "name": file,
-                            "path": file_path,
-                            "size": os.path.getsize(file_path)
-                        })
-            except Exception as e:
-                if debug:
-                    result_data["extraction"]["list_error"] = str(e)
-            
-            if verbose:
-                result_data["message"] = f"文件已解压到{extract_dir}"
-        else:
-            result_data["extraction"] = {
-                "success": False,
-                "error": "文件解压失败"
-            }
-    
-    return result_data
+    return _OP_HANDLERS.get(operation, _op_info)(params, result_data, source)
+
+
+def _write_bytes(output_file: str, data: bytes, durable: bool = False) -> None:
+    """
+    不经过Python文件对象，直接用 os.write 写出整块数据（短写时继续写剩余部分）
+    durable 为真时写完执行 fdatasync（平台不支持时用 fsync），否则不做刷盘
+    """
+    fd = os.open(output_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_CLOEXEC', 0)
+                 | getattr(os, 'O_BINARY', 0), 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            written = os.write(fd, view)
+            view = view[written:]
+        if durable:
+            getattr(os, 'fdatasync', os.fsync)(fd)
+    finally:
+        os.close(fd)
 
 
 def generate_output_file(params: Dict[str, Any], result_data: Dict[str, Any]) -> Optional[str]:
@@ -396,8 +777,7 @@ def generate_output_file(params: Dict[str, Any], result_data: Dict[str, Any]) ->
     if operation in ["info", "preview"]:
         output_file = os.path.join(output_dir, 'file_operation_result.json')
         try:
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(result_data, f, ensure_ascii=False, indent=2)
+            _write_bytes(output_file, dump_json_bytes(result_data), params.get('durable', False))
             return output_file
         except Exception as e:
             if params.get('debug', False):
@@ -417,33 +797,29 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
     处理请求的主函数
     包含参数验证、业务逻辑处理和结果生成
     """
-    # 1. 标准参数验证
-    is_valid, error_result = validate_parameters(params, ARGS_MAP)
-    if not is_valid:
-        return error_result
-    
-    # 2. 自定义参数验证
-    is_valid, error_result = validate_custom_parameters(params)
-    if not is_valid:
+    # 1. 参数验证（标准验证与自定义验证），通过时得到已打开的输入文件
+    source, error_result = _validate_fast(params)
+    if source is None:
         return error_result
     
-    # 3. 处理业务逻辑
-    try:
-        result_data = process_business_logic(params)
-    except Exception as e:
-        if params.get('debug', False):
-            print(f"业务逻辑处理失败: {str(e)}", file=sys.stderr)
-            print(traceback.format_exc(), file=sys.stderr)
-        
-        return ResourceError(
-            message=f"处理业务逻辑时发生错误: {str(e)}",
-            resource_type="file_processing"
-        ).to_dict()
+    with source:
+        # 2. 处理业务逻辑
+        try:
+            result_data = process_business_logic(params, source)
+        except Exception as e:
+            if params.get('debug', False):
+                print(f"业务逻辑处理失败: {str(e)}", file=sys.stderr)
+                print(traceback.format_exc(), file=sys.stderr)
+            
+            return ResourceError(
+                message=f"处理业务逻辑时发生错误: {str(e)}",
+                resource_type="file_processing"
+            ).to_dict()
     
-    # 4. 生成输出文件（如果需要）
+    # 3. 生成输出文件（如果需要）
     output_file = generate_output_file(params, result_data)
     
-    # 5. 构建响应数据
+    # 4. 构建响应数据
     response_data = result_data
     if output_file:
         response_data["output_file"] = output_file
@@ -454,16 +830,20 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
     )
 
 
-# =============================================================================
-# 入口函数
-# =============================================================================
+_PARSER: Optional[argparse.ArgumentParser] = None
 
-def main():
-    """主函数 - 处理命令行参数并调用处理函数"""
-    # 1. 创建参数解析器
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    返回根据ARGS_MAP构建的命令行解析器
+    首次调用时构建并缓存，--_sys_get_schema 探测不会触发构建
+    """
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+    
     parser = argparse.ArgumentParser(description='文件处理脚本 - 支持文件上传、转换和下载')
     
-    # 2. 添加所有参数
     for key, cfg in ARGS_MAP.items():
         param_type = cfg.get("type", "str")
         required = cfg.get("required", False)
@@ -496,22 +876,32 @@ def main():
                 default=default
             )
     
-    # 3. 处理特殊参数 --_sys_get_schema
+    _PARSER = parser
+    return parser
+
+
+# =============================================================================
+# 入口函数
+# =============================================================================
+
+def main():
+    """主函数 - 处理命令行参数并调用处理函数"""
+    # 处理特殊参数 --_sys_get_schema（在构建解析器之前直接返回）
     if len(sys.argv) > 1 and sys.argv[1] == "--_sys_get_schema":
         print(get_schema())
         sys.exit(0)
     
-    # 4. 解析命令行参数
-    args = parser.parse_args()
+    # 1. 解析命令行参数（解析器按ARGS_MAP只构建一次）
+    args = get_parser().parse_args()
     
-    # 5. 构建参数字典
+    # 2. 构建参数字典
     params = {}
     for key in ARGS_MAP.keys():
         value = getattr(args, key, None)
         if value is not None:
             params[key] = value
     
-    # 6. 处理请求并打印结果
+    # 3. 处理请求并打印结果
     result = process_request(params)
     print_json_response(result)
 
@@ -65,14 +65,14 @@ def process_hello_request(params):
 
 def main():
     """主函数"""
-    parser = argparse.ArgumentParser()
-    for key, cfg in ARGS_MAP.items():
-        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
-
     if len(sys.argv) > 1 and sys.argv[1] == "--_sys_get_schema":
         print(get_schema())
         sys.exit(0)
 
+    parser = argparse.ArgumentParser()
+    for key, cfg in ARGS_MAP.items():
+        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
+
     args = parser.parse_args()
     
     # 构建参数字典
@@ -59,14 +59,14 @@ def grayscale_image(image_path):
         return {"success": False, "error": str(e)}
 
 def main():
-    parser = argparse.ArgumentParser()
-    for key, cfg in ARGS_MAP.items():
-        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
-    
     if len(sys.argv) > 1 and sys.argv[1] == "--_sys_get_schema":
         print(get_schema())
         sys.exit(0)
     
+    parser = argparse.ArgumentParser()
+    for key, cfg in ARGS_MAP.items():
+        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
+    
     args = parser.parse_args()
     image_path = getattr(args, 'image', '')
     operation = getattr(args, 'operation', 'resize')
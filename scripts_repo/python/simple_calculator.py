@@ -12,14 +12,14 @@ def get_schema():
     return json.dumps(ARGS_MAP, ensure_ascii=False)
 
 def main():
-    parser = argparse.ArgumentParser()
-    for key, cfg in ARGS_MAP.items():
-        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
-    
     if len(sys.argv) > 1 and sys.argv[1] == "--_sys_get_schema":
         print(get_schema())
         sys.exit(0)
     
+    parser = argparse.ArgumentParser()
+    for key, cfg in ARGS_MAP.items():
+        parser.add_argument(cfg["flag"], required=cfg.get("required", False), help=cfg.get("help", ""))
+    
     args = parser.parse_args()
     operation = getattr(args, 'operation', 'add')
     a = getattr(args, 'a', 0)
@@ -10,9 +10,11 @@ import argparse
 import json
 import sys
 import os
+import stat
 import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple, List
+from typing import Dict, Any, Callable, Iterator, Optional, Tuple, List
 
 # 添加项目根目录到Python路径
 project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,12 +24,13 @@ from src.core.error_handler import (
     handle_script_errors, 
     ValidationError, 
     ResourceError, 
-    validate_parameters,
     create_success_response,
     create_content_response,
-    print_json_response
+    print_json_response,
+    dump_json_bytes
 )
 from src.utils.logger import get_script_logger
+from src.utils.fast_stat import fast_stat
 
 # 获取日志记录器
 script_name = os.path.splitext(os.path.basename(__file__))[0]
@@ -111,6 +114,41 @@ ARGS_MAP: Dict[str, Dict[str, Any]] = {
         "default": True
     },
     
+    # 解码参数（默认贪心解码）
+    "beam_size": {
+        "flag": "--beam-size", 
+        "type": "int", 
+        "required": False, 
+        "help": "束搜索宽度（1表示贪心解码）", 
+        "default": 1
+    },
+    
+    "best_of": {
+        "flag": "--best-of", 
+        "type": "int", 
+        "required": False, 
+        "help": "采样时的候选数量（仅温度大于0时生效）", 
+        "default": 1
+    },
+    
+    # faster-whisper后端参数
+    "compute_type": {
+        "flag": "--compute-type", 
+        "type": "choice", 
+        "required": False, 
+        "help": "faster-whisper计算精度（auto表示CPU用int8，GPU按fp16参数选择float16/float32）", 
+        "default": "auto",
+        "choices": ["auto", "int8", "int8_float16", "float16", "float32"]
+    },
+    
+    "vad_filter": {
+        "flag": "--vad-filter", 
+        "type": "bool", 
+        "required": False, 
+        "help": "是否先用VAD过滤静音段（faster-whisper，默认关闭）", 
+        "default": False
+    },
+    
     "debug": {
         "flag": "--debug", 
         "type": "bool", 
@@ -120,51 +158,150 @@ ARGS_MAP: Dict[str, Dict[str, Any]] = {
     }
 }
 
+# 支持的音频格式（元组用于错误提示中按顺序列出，集合用于O(1)判断）
+SUPPORTED_AUDIO_FORMATS = ('.mp3', '.wav', '.m4a', '.flac', '.ogg', '.webm')
+_SUPPORTED_AUDIO_FORMAT_SET = frozenset(SUPPORTED_AUDIO_FORMATS)
+
 # =============================================================================
 # 辅助函数区域
 # =============================================================================
 
+_SCHEMA_JSON: Optional[str] = None
+
+
 def get_schema() -> str:
     """
     返回参数定义的JSON格式字符串
-    用于系统自动获取参数定义
+    用于系统自动获取参数定义（ARGS_MAP不变，序列化结果只生成一次）
     """
-    return json.dumps(ARGS_MAP, ensure_ascii=False)
+    global _SCHEMA_JSON
+    if _SCHEMA_JSON is None:
+        _SCHEMA_JSON = json.dumps(ARGS_MAP, ensure_ascii=False)
+    return _SCHEMA_JSON
 
 
-def validate_custom_parameters(params: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
+def _check_audio_file(params: Dict[str, Any], audio_file: str) -> Optional[ValidationError]:
+    """检查音频文件存在、是普通文件且格式受支持；一次stat，结果随参数传给转录器复用"""
+    try:
+        st = params['_audio_stat'] = fast_stat(audio_file)
+    except OSError:
+        return ValidationError("音频文件不存在", parameter="audio_file", value=audio_file)
+    
+    if not stat.S_ISREG(st.st_mode):
+        return ValidationError("音频路径不是文件", parameter="audio_file", value=audio_file)
+    
+    file_ext = os.path.splitext(audio_file)[1].lower()
+    if file_ext not in _SUPPORTED_AUDIO_FORMAT_SET:
+        return ValidationError(
+            f"不支持的音频格式: {file_ext}。支持的格式: {', '.join(SUPPORTED_AUDIO_FORMATS)}",
+            parameter="audio_file",
+            value=audio_file
+        )
+    return None
+
+
+# 布尔参数的字符串取值
+_BOOL_TRUE = frozenset({'true', '1', 'yes', 'on'})
+_BOOL_FALSE = frozenset({'false', '0', 'no', 'off'})
+
+
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        return value.lower() in _BOOL_TRUE
+    return bool(value)
+
+
+# 各参数类型的转换函数，file/str/choice 保持原值
+_CASTERS = {"int": int, "float": float, "bool": _to_bool}
+
+
+def _check_positive(name: str):
+    """生成检查参数为正整数的函数"""
+    def check(params: Dict[str, Any], value: int) -> Optional[ValidationError]:
+        if value < 1:
+            return ValidationError(f"参数 {name} 必须大于0", parameter=name, value=value)
+        return None
+    return check
+
+
+# 需要额外检查的参数
+_EXTRA_CHECKS = {
+    "audio_file": _check_audio_file,
+    "beam_size": _check_positive("beam_size"),
+    "best_of": _check_positive("best_of"),
+}
+
+
+def _compile_validators(args_map: Dict[str, Dict[str, Any]]) -> tuple:
+    """
+    把参数定义预编译为 (名称, 类型, 是否必需, 转换函数, 可选值集合, 额外检查) 元组，
+    验证时不再查ARGS_MAP
+    """
+    validators = []
+    for name, meta in args_map.items():
+        param_type = meta.get("type", "str")
+        choices = meta.get("choices")
+        validators.append((
+            name,
+            param_type,
+            meta.get("required", False),
+            _CASTERS.get(param_type),
+            frozenset(choices) if choices else None,
+            _EXTRA_CHECKS.get(name),
+        ))
+    return tuple(validators)
+
+
+_VALIDATORS = _compile_validators(ARGS_MAP)
+
+
+def validate_request_parameters(params: Dict[str, Any]) -> Tuple[bool, Optional[Dict[str, Any]]]:
     """
-    自定义参数验证函数
+    参数验证：按预编译的参数表一次遍历完成必需项、类型转换、可选值和音频文件检查
     
     Args:
         params: 参数字典
         
     Returns:
-        tuple: (是否验证通过, 错误结果字典)
+        tuple: (是否验证通过, 错误结果字典)；有多个错误时一并返回，details.errors 列出每一项
     """
-    # 检查音频文件是否存在
-    audio_file = params.get('audio_file')
-    if audio_file and not os.path.exists(audio_file):
-        return False, ValidationError(
-            "音频文件不存在",
-            parameter="audio_file",
-            value=audio_file
-        ).to_dict()
-    
-    # 检查音频文件格式
-    if audio_file:
-        supported_formats = ['.mp3', '.wav', '.m4a', '.flac', '.ogg', '.webm']
-        file_ext = Path(audio_file).suffix.lower()
-        if file_ext not in supported_formats:
-            return False, ValidationError(
-                f"不支持的音频格式: {file_ext}。支持的格式: {', '.join(supported_formats)}",
-                parameter="audio_file",
-                value=audio_file
-            ).to_dict()
+    errors: List[ValidationError] = []
+    for name, param_type, required, caster, choices, extra_check in _VALIDATORS:
+        value = params.get(name)
+        if value is None or value == '':
+            if required:
+                errors.append(ValidationError(f"缺少必需参数: {name}", parameter=name))
+            continue
+        
+        if caster is not None:
+            try:
+                value = params[name] = caster(value)
+            except ValueError:
+                errors.append(ValidationError(f"参数 {name} 类型错误，期望 {param_type}", parameter=name, value=value))
+                continue
+        
+        if choices is not None and value not in choices:
+            errors.append(ValidationError(
+                f"参数 {name} 取值无效，可选值: {', '.join(sorted(choices))}",
+                parameter=name,
+                value=value
+            ))
+            continue
+        
+        if extra_check is not None:
+            error = extra_check(params, value)
+            if error is not None:
+                errors.append(error)
+    
+    if errors:
+        if len(errors) == 1:
+            return False, errors[0].to_dict()
+        result = ValidationError("参数验证失败: " + "；".join(error.message for error in errors)).to_dict()
+        result["details"]["errors"] = [{"message": error.message, **error.details} for error in errors]
+        return False, result
     
     # 检查模型和设备的兼容性
-    device = params.get('device', 'cpu')
-    if device == 'cpu' and params.get('fp16', True):
+    if params.get('device', 'cpu') == 'cpu' and params.get('fp16', True):
         logger.warning("CPU模式不支持FP16精度，将使用FP32")
     
     return True, None
@@ -196,11 +333,7 @@ def parse_key_value_args(argv: List[str]) -> Dict[str, Any]:
             # 这是一个键
             key = arg
             # 查找对应的参数定义
-            param_def = None
-            for param_name, param_config in ARGS_MAP.items():
-                if param_name == key:
-                    param_def = param_config
-                    break
+            param_def = ARGS_MAP.get(key)
             
             if param_def:
                 # 获取值
@@ -211,9 +344,10 @@ def parse_key_value_args(argv: List[str]) -> Dict[str, Any]:
                     
                     # 处理布尔值
                     if param_def.get("type") == "bool":
-                        if value.lower() in ['true', '1', 'yes', 'on']:
+                        lowered = value.lower()
+                        if lowered in _BOOL_TRUE:
                             value = True
-                        elif value.lower() in ['false', '0', 'no', 'off']:
+                        elif lowered in _BOOL_FALSE:
                             value = False
                         else:
                             # 如果是布尔参数但没有提供值，默认为True
@@ -264,8 +398,9 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
     if not success:
         raise ResourceError(error.get('message', '模型加载失败'))
     
-    # 执行转录
+    # 执行转录，完成后立即释放模型
     success, result = transcriber.transcribe_audio()
+    transcriber.release_model()
     if not success:
         raise ResourceError(error.get('message', '音频转录失败'))
     
@@ -288,6 +423,48 @@ def process_business_logic(params: Dict[str, Any]) -> Dict[str, Any]:
 # 转换器类
 # =============================================================================
 
+# 延迟导入的opencc模块：None 表示尚未导入，False 表示未安装
+_opencc_module: Any = None
+# OpenCC转换器实例缓存（按配置名），字典文件在进程内只加载一次
+_OPENCC_CACHE: Dict[str, Any] = {}
+
+
+def _load_opencc() -> Optional[Any]:
+    """导入opencc模块（只尝试一次），未安装时返回None"""
+    global _opencc_module
+    if _opencc_module is None:
+        try:
+            import opencc
+            _opencc_module = opencc
+        except ImportError:
+            _opencc_module = False
+    return _opencc_module or None
+
+
+def _get_opencc(name: str) -> Optional[Any]:
+    """
+    获取指定配置（如 t2s、s2t）的OpenCC转换器，多个TextConverter共享同一实例
+    
+    Args:
+        name: OpenCC配置名
+        
+    Returns:
+        OpenCC转换器实例，未安装OpenCC时返回None
+    """
+    converter = _OPENCC_CACHE.get(name)
+    if converter is None:
+        opencc = _load_opencc()
+        if opencc is None:
+            return None
+        converter = _OPENCC_CACHE[name] = opencc.OpenCC(name)
+    return converter
+
+
+def _identity(text: str) -> str:
+    """不做转换，原样返回"""
+    return text
+
+
 class TextConverter:
     """简化的文本转换器"""
     
@@ -302,22 +479,26 @@ class TextConverter:
         self.t2s_converter = None
         self.s2t_converter = None
         self._init_converters()
+        
+        # 初始化时确定转换步骤；没有可用的转换器时 convert 直接替换为原样返回，调用时不再逐次判断
+        self._steps = tuple(c.convert for c in (self.t2s_converter, self.s2t_converter) if c is not None)
+        if not self._steps:
+            self.convert = _identity
     
     def _init_converters(self) -> None:
         """初始化转换器"""
         if self.format_type == "none":
             return
         
-        try:
-            import opencc
-        except ImportError:
+        if _load_opencc() is None:
             logger.warning(f"OpenCC未安装，无法进行{self.format_type}转换")
             return
         
+        # 转换器实例按配置名缓存，重复创建TextConverter不会重新加载字典
         if "t2s" in self.format_type:
-            self.t2s_converter = opencc.OpenCC('t2s')
+            self.t2s_converter = _get_opencc('t2s')
         if "s2t" in self.format_type:
-            self.s2t_converter = opencc.OpenCC('s2t')
+            self.s2t_converter = _get_opencc('s2t')
     
     def convert(self, text: str) -> str:
         """
@@ -329,17 +510,14 @@ class TextConverter:
         Returns:
             转换后的文本
         """
-        if self.format_type == "none" or not text:
+        if not text:
             return text
         
         result = text
         
         try:
-            if self.t2s_converter:
-                result = self.t2s_converter.convert(result)
-            
-            if self.s2t_converter:
-                result = self.s2t_converter.convert(result)
+            for step in self._steps:
+                result = step(result)
             
             return result
         except Exception as e:
@@ -347,10 +525,119 @@ class TextConverter:
             return text
 
 
+# 不做转换的共享实例（convert_format 为 none 时所有转录器共用）
+_NOOP_CONVERTER = TextConverter("none")
+
+
+# =============================================================================
+# 字幕生成
+# =============================================================================
+
+# 字幕格式定义：(文件头, 条目标识前缀, 毫秒分隔符)
+_SUBTITLE_FORMATS: Dict[str, Tuple[str, str, str]] = {
+    "srt": ("", "", ","),
+    "vtt": ("WEBVTT\n\n", "CUE ", "."),
+}
+
+
+def _fmt_ts(seconds: float, ms_sep: str) -> str:
+    """把秒数格式化为 HH:MM:SS{ms_sep}mmm（整数运算，不经过datetime）"""
+    total_ms = int(round(seconds * 1000))
+    hours, rem = divmod(total_ms, 3_600_000)
+    minutes, rem = divmod(rem, 60_000)
+    secs, millis = divmod(rem, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}{ms_sep}{millis:03d}"
+
+
+def _iter_cues(segments: List[Dict[str, Any]], cue_prefix: str, ms_sep: str,
+               convert: Callable[[str], str]) -> Iterator[str]:
+    """
+    按Whisper分段逐条生成字幕条目（标识、时间轴、文本，末尾带换行）
+    
+    Args:
+        segments: Whisper转录结果中的 segments（含 start、end、text）
+        cue_prefix: 条目标识前缀（VTT为 "CUE "，SRT为空）
+        ms_sep: 时间戳中秒与毫秒的分隔符
+        convert: 文本转换函数，逐段生成时才调用
+    """
+    for i, segment in enumerate(segments, 1):
+        start = _fmt_ts(segment.get('start', 0), ms_sep)
+        end = _fmt_ts(segment.get('end', 0), ms_sep)
+        yield f"{cue_prefix}{i}\n{start} --> {end}\n{convert(segment.get('text', '').strip())}\n"
+
+
 # =============================================================================
 # 转录器类
 # =============================================================================
 
+# CUDA探测结果 (是否可用, 设备数)，进程内只探测一次；None 表示尚未探测
+_CUDA_STATUS: Optional[Tuple[bool, int]] = None
+
+
+def _cuda_status() -> Tuple[bool, int]:
+    """返回 (CUDA是否可用, GPU设备数)；torch在此处才导入，未安装时视为不可用"""
+    global _CUDA_STATUS
+    if _CUDA_STATUS is None:
+        try:
+            import torch
+            available = torch.cuda.is_available()
+            _CUDA_STATUS = (available, torch.cuda.device_count() if available else 0)
+        except ImportError:
+            _CUDA_STATUS = (False, 0)
+    return _CUDA_STATUS
+
+
+@lru_cache(maxsize=1)
+def _faster_whisper_model_class() -> Optional[Any]:
+    """导入 faster_whisper.WhisperModel（只尝试一次），未安装时返回None"""
+    try:
+        from faster_whisper import WhisperModel
+        return WhisperModel
+    except ImportError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def _whisper_module() -> Optional[Any]:
+    """导入 openai-whisper 模块（只尝试一次），未安装时返回None"""
+    try:
+        import whisper
+        return whisper
+    except ImportError:
+        return None
+
+
+# Whisper要求的输入采样率
+WHISPER_SAMPLE_RATE = 16000
+# 可以用soundfile直接解码、无需ffmpeg的格式
+_DIRECT_DECODE_FORMATS = frozenset({'.wav', '.flac'})
+
+
+@lru_cache(maxsize=4)
+def _decode_audio(path: str, size: int, mtime_ns: int) -> Optional[Any]:
+    """
+    用soundfile把16kHz的WAV/FLAC解码为单声道float32数组，结果按 (路径, 大小, 修改时间) 缓存
+    未安装soundfile、采样率不是16kHz（需要重采样）或解码失败时返回None，交给Whisper用ffmpeg解码
+    """
+    try:
+        import soundfile
+    except ImportError:
+        return None
+    
+    try:
+        if soundfile.info(path).samplerate != WHISPER_SAMPLE_RATE:
+            return None
+        audio, _ = soundfile.read(path, dtype='float32', always_2d=False)
+    except Exception as e:
+        logger.warning(f"soundfile解码失败，改用ffmpeg: {str(e)}")
+        return None
+    
+    # 多声道取平均混为单声道
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1, dtype='float32')
+    return audio
+
+
 class WhisperTranscriber:
     """简化的Whisper转录器"""
     
@@ -370,21 +657,26 @@ class WhisperTranscriber:
         # 转录参数
         self.fp16 = params.get('fp16', True)
         self.word_timestamps = params.get('word_timestamps', False)
+        self.beam_size = params.get('beam_size', 1)
+        self.best_of = params.get('best_of', 1)
+        self.compute_type = params.get('compute_type', 'auto')
+        self.vad_filter = params.get('vad_filter', False)
         
         # 转换器
         convert_format = params.get('convert_format', 'none')
-        self.converter = TextConverter(convert_format)
+        self.converter = _NOOP_CONVERTER if convert_format == "none" else TextConverter(convert_format)
         
-        # 初始化模型
+        # 初始化模型（backend 为 faster-whisper 或 openai-whisper）
         self.model = None
+        self._model_device = None
+        self.backend = None
+        
+        # Whisper原始分段（生成字幕时使用）
+        self._segments: List[Dict[str, Any]] = []
     
     def _check_cuda_available(self) -> bool:
-        """检查CUDA是否可用"""
-        try:
-            import torch
-            return torch.cuda.is_available()
-        except ImportError:
-            return False
+        """检查CUDA是否可用（探测结果缓存在模块级）"""
+        return _cuda_status()[0]
     
     def load_model(self) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
@@ -393,22 +685,41 @@ class WhisperTranscriber:
         Returns:
             tuple: (是否成功, 错误信息字典)
         """
+        # 确定设备（指定CPU时不探测CUDA）
+        device = "cuda" if self.device != "cpu" and self._check_cuda_available() else "cpu"
+        
+        # 优先使用 faster-whisper（CTranslate2，CPU上INT8量化），未安装时回退到 openai-whisper
+        WhisperModel = _faster_whisper_model_class()
+        if WhisperModel is not None:
+            try:
+                compute_type = self.compute_type
+                if compute_type == "auto":
+                    if device == "cpu":
+                        compute_type = "int8"
+                    else:
+                        compute_type = "float16" if self.fp16 else "float32"
+                self.model = WhisperModel(self.model_name, device=device, compute_type=compute_type,
+                                          cpu_threads=os.cpu_count() or 0)
+                self._model_device = device
+                self.backend = "faster-whisper"
+                return True, None
+            except Exception as e:
+                logger.warning(f"faster-whisper模型加载失败，回退到openai-whisper: {str(e)}")
+        
+        whisper = _whisper_module()
+        if whisper is None:
+            return False, ResourceError(
+                "Whisper库未安装，请运行: pip install faster-whisper 或 pip install openai-whisper",
+                resource_type="Whisper"
+            ).to_dict()
+        
         try:
-            import whisper
-            
-            # 确定设备
-            device = "cuda" if self._check_cuda_available() and self.device != "cpu" else "cpu"
-            
             # 加载模型
             self.model = whisper.load_model(self.model_name, device=device)
+            self._model_device = device
+            self.backend = "openai-whisper"
             
             return True, None
-            
-        except ImportError:
-            return False, ResourceError(
-                "Whisper库未安装，请运行: pip install openai-whisper",
-                resource_type="Whisper"
-            ).to_dict()
         
         except Exception as e:
             return False, ResourceError(
@@ -416,6 +727,22 @@ class WhisperTranscriber:
                 resource_type="WhisperModel"
             ).to_dict()
     
+    def release_model(self) -> None:
+        """
+        释放模型引用（不调用 gc.collect，避免遍历整个对象图）
+        模型在GPU上时清空CUDA缓存，把显存归还给其他进程
+        """
+        if self.model is None:
+            return
+        self.model = None
+        if self._model_device == "cuda":
+            try:
+                import torch
+                torch.cuda.empty_cache()
+            except ImportError:
+                pass
+        self._model_device = None
+    
     def transcribe_audio(self) -> Tuple[bool, Optional[Dict[str, Any]]]:
         """
         转录音频
@@ -424,19 +751,27 @@ class WhisperTranscriber:
             tuple: (是否成功, 转录结果或错误信息字典)
         """
         try:
+            if self.backend == "faster-whisper":
+                return True, self._transcribe_faster_whisper()
+            
             # 转录参数
             transcribe_kwargs = {
                 "language": None if self.language == "auto" else self.language,
                 "word_timestamps": self.word_timestamps,
-                "verbose": False
+                "verbose": False,
+                "best_of": self.best_of
             }
             
+            # openai-whisper 在 beam_size 为空时使用GreedyDecoder；beam_size=1 仍会走束搜索逻辑
+            if self.beam_size > 1:
+                transcribe_kwargs["beam_size"] = self.beam_size
+            
             # 只有在非CPU设备上才使用fp16
             if self.device != "cpu" and self.fp16:
                 transcribe_kwargs["fp16"] = True
             
             # 执行转录
-            result = self.model.transcribe(str(self.audio_file), **transcribe_kwargs)
+            result = self.model.transcribe(self._audio_input(), **transcribe_kwargs)
             
             return True, result
             
@@ -446,6 +781,45 @@ class WhisperTranscriber:
                 resource_type="AudioTranscription"
             ).to_dict()
     
+    def _transcribe_faster_whisper(self) -> Dict[str, Any]:
+        """
+        使用faster-whisper转录，并整理成与openai-whisper相同结构的结果字典
+        
+        Returns:
+            包含 text、segments、language、duration 的结果字典
+        """
+        segments, info = self.model.transcribe(
+            self._audio_input(),
+            language=None if self.language == "auto" else self.language,
+            word_timestamps=self.word_timestamps,
+            vad_filter=self.vad_filter,
+            beam_size=self.beam_size,
+            best_of=self.best_of
+        )
+        
+        # segments 是生成器，遍历时才逐段解码
+        segment_list = []
+        for segment in segments:
+            item = {
+                "id": segment.id,
+                "start": segment.start,
+                "end": segment.end,
+                "text": segment.text
+            }
+            if self.word_timestamps and segment.words:
+                item["words"] = [
+                    {"word": word.word, "start": word.start, "end": word.end, "probability": word.probability}
+                    for word in segment.words
+                ]
+            segment_list.append(item)
+        
+        return {
+            "text": "".join(item["text"] for item in segment_list),
+            "segments": segment_list,
+            "language": info.language,
+            "duration": info.duration
+        }
+    
     def process_result(self, result: Dict[str, Any]) -> Dict[str, Any]:
         """
         处理转录结果
@@ -456,6 +830,9 @@ class WhisperTranscriber:
         Returns:
             处理后的结果字典
         """
+        # 分段留给字幕生成使用，不写入结果
+        self._segments = result.get('segments') or []
+        
         # 转换文本格式
         original_text = result.get('text', '')
         converted_text = self.converter.convert(original_text)
@@ -469,14 +846,37 @@ class WhisperTranscriber:
             },
             "metadata": {
                 "model": self.model_name,
+                "backend": self.backend,
                 "device": self.device,
                 "convert_format": self.converter.format_type,
                 "audio_file": str(self.audio_file),
-                "audio_size": self.audio_file.stat().st_size,
+                "audio_size": self._audio_size(),
                 "processed_at": time.strftime("%Y-%m-%d %H:%M:%S")
             }
         }
     
+    def _audio_stat(self) -> os.stat_result:
+        """音频文件的stat结果，优先使用参数验证时的结果"""
+        st = self.params.get('_audio_stat')
+        if st is None:
+            st = self.params['_audio_stat'] = fast_stat(str(self.audio_file))
+        return st
+    
+    def _audio_size(self) -> int:
+        """音频文件大小"""
+        return self._audio_stat().st_size
+    
+    def _audio_input(self) -> Any:
+        """
+        转录输入：16kHz的WAV/FLAC直接解码为float32数组（不启动ffmpeg子进程），其他情况返回文件路径
+        """
+        if self.audio_file.suffix.lower() in _DIRECT_DECODE_FORMATS:
+            st = self._audio_stat()
+            audio = _decode_audio(str(self.audio_file), st.st_size, st.st_mtime_ns)
+            if audio is not None:
+                return audio
+        return str(self.audio_file)
+    
     def save_result(self, result: Dict[str, Any]) -> Tuple[bool, Optional[str]]:
         """
         生成结果内容
@@ -491,14 +891,12 @@ class WhisperTranscriber:
             output_format = self.params.get('output_format', 'json')
             
             # 根据格式生成内容
-            if output_format == "json":
-                content = json.dumps(result, ensure_ascii=False, indent=2)
-            elif output_format == "text":
+            if output_format == "text":
                 content = result['transcription']['converted_text']
             elif output_format in ["srt", "vtt"]:
                 content = self._generate_subtitle_content(result, output_format)
             else:
-                content = json.dumps(result, ensure_ascii=False, indent=2)
+                content = dump_json_bytes(result).decode('utf-8')
             
             return True, content
             
@@ -517,37 +915,22 @@ class WhisperTranscriber:
         Returns:
             str: 字幕内容
         """
-        content = []
+        subtitle_format = _SUBTITLE_FORMATS.get(format_type)
+        if subtitle_format is None:
+            return ""
+        header, cue_prefix, ms_sep = subtitle_format
         
-        if format_type == "srt":
-            content.append(f"// 转录结果: {self.audio_file.name}")
-            content.append(f"// 模型: {self.model_name}")
-            content.append(f"// 语言: {result['transcription']['language']}")
-            content.append("")
-            
-            lines = result['transcription']['converted_text'].split('\n')
-            for i, line in enumerate(lines, 1):
-                content.append(f"{i}")
-                content.append(f"00:00:00,000 --> 00:00:05,000")
-                content.append(f"{line}")
-                content.append("")
-                
-        elif format_type == "vtt":
-            content.append("WEBVTT")
-            content.append("")
-            content.append(f"// 转录结果: {self.audio_file.name}")
-            content.append(f"// 模型: {self.model_name}")
-            content.append(f"// 语言: {result['transcription']['language']}")
-            content.append("")
-            
-            lines = result['transcription']['converted_text'].split('\n')
-            for i, line in enumerate(lines, 1):
-                content.append(f"CUE {i}")
-                content.append(f"00:00:00.000 --> 00:00:05.000")
-                content.append(f"{line}")
-                content.append("")
+        transcription = result['transcription']
+        if format_type == "vtt":
+            # 转录信息写入WebVTT的NOTE注释块（SRT没有注释语法，不输出）
+            header += (
+                f"NOTE\n转录结果: {self.audio_file.name}\n"
+                f"模型: {self.model_name}\n"
+                f"语言: {transcription['language']}\n\n"
+            )
         
-        return "\n".join(content)
+        # 每个Whisper分段一个条目，使用分段自带的起止时间；文本逐段转换，条目之间以空行分隔
+        return header + "\n".join(_iter_cues(self._segments, cue_prefix, ms_sep, self.converter.convert))
 
 
 # =============================================================================
@@ -565,20 +948,15 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
     Returns:
         Dict: 处理结果
     """
-    # 1. 标准参数验证
-    is_valid, error_result = validate_parameters(params, ARGS_MAP)
-    if not is_valid:
-        return error_result
-    
-    # 2. 自定义参数验证
-    is_valid, error_result = validate_custom_parameters(params)
+    # 1. 参数验证（标准验证与自定义验证一次完成）
+    is_valid, error_result = validate_request_parameters(params)
     if not is_valid:
         return error_result
     
-    # 3. 处理业务逻辑
+    # 2. 处理业务逻辑
     result_data = process_business_logic(params)
     
-    # 4. 返回内容响应
+    # 3. 返回内容响应
     return create_content_response(
         content=result_data["content"],
         metadata={
@@ -589,6 +967,68 @@ def process_request(params: Dict[str, Any]) -> Dict[str, Any]:
     )
 
 
+_PARSER: Optional[argparse.ArgumentParser] = None
+
+
+def _parse_bool(value: str) -> bool:
+    """解析命令行布尔值（true/1/yes/on 为真，其余为假）"""
+    return value.lower() in _BOOL_TRUE
+
+
+def get_parser() -> argparse.ArgumentParser:
+    """
+    返回根据ARGS_MAP构建的命令行解析器
+    首次调用时构建并缓存，同一进程内多次调用 main() 时复用
+    """
+    global _PARSER
+    if _PARSER is not None:
+        return _PARSER
+    
+    parser = argparse.ArgumentParser(description='Whisper音频转录脚本')
+    
+    # 添加所有参数
+    for key, cfg in ARGS_MAP.items():
+        param_type = cfg.get("type", "str")
+        required = cfg.get("required", False)
+        default = cfg.get("default")
+        help_text = cfg.get("help", "")
+        
+        if param_type == "bool":
+            # --flag 单独出现为True，也接受 --flag 1/0（网关传参方式）；--no-flag 显式关闭
+            dest = cfg["flag"].lstrip('-').replace('-', '_')
+            parser.add_argument(
+                cfg["flag"], 
+                help=help_text,
+                type=_parse_bool,
+                nargs='?',
+                const=True,
+                default=default
+            )
+            parser.add_argument(
+                f"--no-{cfg['flag'].lstrip('-')}",
+                help=f"关闭：{help_text}",
+                action='store_false',
+                dest=dest
+            )
+        elif param_type == "choice" and "choices" in cfg:
+            parser.add_argument(
+                cfg["flag"], 
+                help=help_text,
+                choices=cfg["choices"],
+                default=default
+            )
+        else:
+            parser.add_argument(
+                cfg["flag"], 
+                help=help_text,
+                required=required,
+                default=default
+            )
+    
+    _PARSER = parser
+    return parser
+
+
 # =============================================================================
 # 入口函数
 # =============================================================================
@@ -617,41 +1057,8 @@ def main():
         # 使用键值对解析器
         params = parse_key_value_args(sys.argv)
     else:
-        # 使用标准argparse解析器
-        parser = argparse.ArgumentParser(description='Whisper音频转录脚本')
-        
-        # 添加所有参数
-        for key, cfg in ARGS_MAP.items():
-            param_type = cfg.get("type", "str")
-            required = cfg.get("required", False)
-            default = cfg.get("default")
-            help_text = cfg.get("help", "")
-            
-            if param_type == "bool":
-                parser.add_argument(
-                    cfg["flag"], 
-                    help=help_text,
-                    type=lambda x: x.lower() in ['true', '1', 'yes', 'on'] if x.lower() not in ['false', '0', 'no', 'off'] else False,
-                    default=default,
-                    nargs='?' if default else None
-                )
-            elif param_type == "choice" and "choices" in cfg:
-                parser.add_argument(
-                    cfg["flag"], 
-                    help=help_text,
-                    choices=cfg["choices"],
-                    default=default
-                )
-            else:
-                parser.add_argument(
-                    cfg["flag"], 
-                    help=help_text,
-                    required=required,
-                    default=default
-                )
-        
-        # 解析命令行参数
-        args = parser.parse_args()
+        # 使用标准argparse解析器（解析器按ARGS_MAP只构建一次）
+        args = get_parser().parse_args()
         
         # 构建参数字典
         params = {}
@@ -3,17 +3,22 @@
 
 import os
 import re
+import shutil
+import stat
 import uuid
 import time
 import requests
 import tempfile
-from pathlib import Path
+from requests.adapters import HTTPAdapter
 from typing import Optional, Tuple, List
 from urllib.parse import urlparse
 from ..core.config import Config
 from ..core.database import get_setting
 from ..utils.file_access_checker import FileAccessChecker
 
+# 下载时每次读写的字节数
+DOWNLOAD_CHUNK_SIZE = 1 << 20
+
 
 class MediaProcessor:
     """媒体文件处理器，支持本地文件和远程URL的统一处理"""
@@ -27,9 +32,17 @@ class MediaProcessor:
         self.audio_extensions = {'.mp3', '.wav', '.m4a', '.flac', '.ogg', '.aac', '.wma'}
         self.video_extensions = {'.mp4', '.avi', '.mkv', '.mov', '.wmv', '.flv', '.webm'}
         self.media_extensions = self.audio_extensions | self.video_extensions
+        # 错误提示中列出的支持格式（预先排序拼接）
+        self._ext_list_str = ', '.join(sorted(self.media_extensions))
         
         # 初始化文件访问检查器
         self.file_access_checker = FileAccessChecker()
+        
+        # 复用连接的HTTP会话（keep-alive，同一主机的多次下载不再重复建立TCP/TLS连接）
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
     
     def is_url(self, path: str) -> bool:
         """判断给定路径是否为URL"""
@@ -61,27 +74,26 @@ class MediaProcessor:
             path = parsed_url.path
             ext = os.path.splitext(path)[1].lower()
             
-            # 如果无法从URL获取扩展名，尝试从Content-Type获取
-            if not ext:
-                response = requests.head(url, timeout=10)
-                content_type = response.headers.get('content-type', '')
-                if 'audio' in content_type:
-                    ext = '.mp3'  # 默认音频扩展名
-                elif 'video' in content_type:
-                    ext = '.mp4'  # 默认视频扩展名
-            
-            # 生成临时文件名
-            temp_filename = f"{uuid.uuid4().hex}{ext}"
-            temp_path = os.path.join(self.temp_dir, temp_filename)
-            
-            # 下载文件
-            response = requests.get(url, timeout=timeout, stream=True)
-            response.raise_for_status()
-            
-            with open(temp_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
+            # 下载文件（流式读取，响应头到达后即可判断类型）
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                
+                # 如果无法从URL获取扩展名，从GET响应的Content-Type获取
+                if not ext:
+                    content_type = response.headers.get('content-type', '')
+                    if 'audio' in content_type:
+                        ext = '.mp3'  # 默认音频扩展名
+                    elif 'video' in content_type:
+                        ext = '.mp4'  # 默认视频扩展名
+                
+                # 生成临时文件名
+                temp_filename = f"{uuid.uuid4().hex}{ext}"
+                temp_path = os.path.join(self.temp_dir, temp_filename)
+                
+                # 按 Content-Encoding 解压后写入文件
+                response.raw.decode_content = True
+                with open(temp_path, 'wb') as f:
+                    shutil.copyfileobj(response.raw, f, DOWNLOAD_CHUNK_SIZE)
             
             return True, temp_path, ""
             
@@ -101,16 +113,19 @@ class MediaProcessor:
         Returns:
             Tuple[是否有效, 错误信息]
         """
-        if not os.path.exists(file_path):
+        # 一次stat同时判断存在性和文件类型
+        try:
+            st = os.stat(file_path)
+        except OSError:
             return False, f"文件不存在: {file_path}"
         
-        if not os.path.isfile(file_path):
+        if not stat.S_ISREG(st.st_mode):
             return False, f"路径不是文件: {file_path}"
         
         # 检查文件扩展名
-        ext = Path(file_path).suffix.lower()
+        ext = os.path.splitext(file_path)[1].lower()
         if ext not in self.media_extensions:
-            return False, f"不支持的媒体文件格式: {ext}，支持的格式: {', '.join(sorted(self.media_extensions))}"
+            return False, f"不支持的媒体文件格式: {ext}，支持的格式: {self._ext_list_str}"
         
         return True, ""
     
@@ -149,7 +164,7 @@ class MediaProcessor:
     
     def get_file_type(self, file_path: str) -> str:
         """获取文件类型（audio/video）"""
-        ext = Path(file_path).suffix.lower()
+        ext = os.path.splitext(file_path)[1].lower()
         if ext in self.audio_extensions:
             return "audio"
         elif ext in self.video_extensions:
@@ -3,13 +3,14 @@
 
 import os
 import time
-import threading
+from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any
-from datetime import datetime, timedelta
+import schedule
 from ..core.config import Config
 from ..core.database import get_setting, set_setting
 from ..utils.logger import get_gateway_logger
+from ..services.cleanup import ensure_scheduler_running
 
 
 class TempFileManager:
@@ -23,8 +24,8 @@ class TempFileManager:
             cleanup_interval_hours: 清理间隔（小时），如果为None则使用配置中的默认值
         """
         self.logger = get_gateway_logger()
-        self.cleanup_thread = None
-        self.stop_event = threading.Event()
+        # 注册在共享调度线程上的清理任务，None 表示未启动
+        self._cleanup_job = None
         
         # 设置清理间隔
         if cleanup_interval_hours is not None:
@@ -69,10 +70,8 @@ class TempFileManager:
     def is_file_expired(self, file_path: str, max_age_hours: int) -> bool:
         """检查文件是否过期"""
         try:
-            file_mtime = os.path.getmtime(file_path)
-            file_time = datetime.fromtimestamp(file_mtime)
-            expire_time = datetime.now() - timedelta(hours=max_age_hours)
-            return file_time < expire_time
+            # 直接比较时间戳，不构造 datetime 对象
+            return os.path.getmtime(file_path) < time.time() - max_age_hours * 3600
         except Exception:
             return True  # 如果无法获取文件时间，视为过期
     
@@ -83,12 +82,30 @@ class TempFileManager:
         if not os.path.isdir(dir_path):
             return expired_files
         
+        # 截止时间只计算一次，逐个文件直接比较时间戳
+        cutoff = time.time() - max_age_hours * 3600
+        
         try:
-            for root, dirs, files in os.walk(dir_path):
-                for file in files:
-                    file_path = os.path.join(root, file)
-                    if self.is_file_expired(file_path, max_age_hours):
-                        expired_files.append(file_path)
+            # 基于 os.scandir 的迭代遍历：DirEntry 自带类型信息，路径无需再拼接
+            stack = [dir_path]
+            while stack:
+                try:
+                    it = os.scandir(stack.pop())
+                except OSError:
+                    continue  # 与 os.walk 一致，跳过无法读取的目录
+                with it:
+                    for entry in it:
+                        if entry.is_dir():
+                            # 与 os.walk 一致：指向目录的符号链接不展开
+                            if not entry.is_symlink():
+                                stack.append(entry.path)
+                            continue
+                        try:
+                            expired = entry.stat().st_mtime < cutoff
+                        except OSError:
+                            expired = True  # 如果无法获取文件时间，视为过期
+                        if expired:
+                            expired_files.append(entry.path)
         except Exception as e:
             self.logger.error(f"扫描过期文件时出错: {str(e)}")
         
@@ -102,10 +119,14 @@ class TempFileManager:
             'errors': []
         }
         
+        # 删除成功的文件所在目录（去重），之后尝试删除其中的空目录
+        parent_dirs = set()
+        
         for file_path in file_paths:
             try:
                 os.remove(file_path)
                 results['success'] += 1
+                parent_dirs.add(os.path.dirname(file_path))
                 self.logger.debug(f"已删除过期文件: {file_path}")
             except Exception as e:
                 results['failed'] += 1
@@ -113,16 +134,14 @@ class TempFileManager:
                 results['errors'].append(error_msg)
                 self.logger.error(error_msg)
         
-        # 尝试删除空目录
-        for file_path in file_paths:
+        # 尝试删除空目录：每个目录只处理一次，由深到浅，子目录删除后父目录也可能变空
+        for parent_dir in sorted(parent_dirs, key=lambda d: d.count(os.sep), reverse=True):
             try:
-                parent_dir = os.path.dirname(file_path)
-                # 如果目录为空，则删除
-                if os.path.isdir(parent_dir) and not os.listdir(parent_dir):
-                    os.rmdir(parent_dir)
-                    self.logger.debug(f"已删除空目录: {parent_dir}")
-            except Exception:
-                pass  # 忽略删除目录的错误
+                # 目录非空时 rmdir 直接失败，无需先列出目录内容
+                os.rmdir(parent_dir)
+                self.logger.debug(f"已删除空目录: {parent_dir}")
+            except OSError:
+                pass  # 忽略删除目录的错误（目录非空等）
         
         return results
     
@@ -157,49 +176,52 @@ class TempFileManager:
         
         return total_results
     
-    def cleanup_loop(self):
-        """清理循环线程"""
-        self.logger.info("临时文件清理线程已启动")
+    def _scheduled_cleanup(self):
+        """定时清理任务：执行一次清理，并按最新配置的间隔安排下一次"""
+        try:
+            self.cleanup_once()
+        except Exception as e:
+            # 异常不能抛出到调度线程，否则会中断其他定时任务
+            self.logger.error(f"清理过程中出错: {str(e)}")
         
-        while not self.stop_event.is_set():
+        # 清理间隔可能已在设置中修改，下一次运行时间按新间隔计算
+        job = self._cleanup_job
+        if job is not None:
             try:
-                self.cleanup_once()
+                job.interval = self.get_cleanup_interval_hours() * 3600
             except Exception as e:
-                self.logger.error(f"清理过程中出错: {str(e)}")
-            
-            # 等待到下一次清理时间
-            interval_hours = self.get_cleanup_interval_hours()
-            interval_seconds = interval_hours * 3600
-            
-            # 使用wait而不是sleep，这样可以响应停止信号
-            self.stop_event.wait(interval_seconds)
-        
-        self.logger.info("临时文件清理线程已停止")
+                self.logger.error(f"读取清理间隔失败，沿用当前间隔: {str(e)}")
     
     def start_cleanup_scheduler(self):
-        """启动清理调度器"""
-        if self.cleanup_thread and self.cleanup_thread.is_alive():
-            self.logger.warning("清理线程已在运行")
+        """启动清理调度器（任务注册到共享调度线程，不单独占用线程）"""
+        if self._cleanup_job is not None:
+            self.logger.warning("清理任务已在运行")
             return
         
-        self.stop_event.clear()
-        self.cleanup_thread = threading.Thread(target=self.cleanup_loop, daemon=True)
-        self.cleanup_thread.start()
+        interval_seconds = self.get_cleanup_interval_hours() * 3600
+        self._cleanup_job = schedule.every(interval_seconds).seconds.do(self._scheduled_cleanup)
+        # 启动后在调度线程的下一次检查时先执行一次清理
+        self._cleanup_job.next_run = datetime.now()
+        ensure_scheduler_running()
         self.logger.info("临时文件清理调度器已启动")
     
+    def is_cleanup_running(self) -> bool:
+        """清理任务是否已注册到调度线程"""
+        return self._cleanup_job is not None
+    
     def stop_cleanup_scheduler(self):
         """停止清理调度器"""
-        if not self.cleanup_thread or not self.cleanup_thread.is_alive():
+        if self._cleanup_job is None:
             return
         
-        self.stop_event.set()
-        self.cleanup_thread.join(timeout=5)
+        schedule.cancel_job(self._cleanup_job)
+        self._cleanup_job = None
         self.logger.info("临时文件清理调度器已停止")
     
     def get_cleanup_status(self) -> Dict[str, Any]:
         """获取清理状态"""
         return {
-            'is_running': self.cleanup_thread and self.cleanup_thread.is_alive(),
+            'is_running': self.is_cleanup_running(),
             'cleanup_interval_hours': self.get_cleanup_interval_hours(),
             'max_age_hours': {
                 'default': self.get_file_max_age_hours('default'),
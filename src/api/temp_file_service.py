@@ -1,9 +1,6 @@
 #!/usr/bin/env python3
 # -*- encoding: utf-8 -*-
 
-import threading
-import time
-from typing import Optional
 from .temp_file_manager import TempFileManager
 from ..utils.logger import get_gateway_logger
 
@@ -17,27 +14,21 @@ class TempFileService:
     
     def __init__(self):
         self.temp_file_manager = TempFileManager()
-        self.cleanup_thread: Optional[threading.Thread] = None
         self.logger = get_gateway_logger()
     
     def start_cleanup_service(self):
         """启动临时文件清理服务"""
-        if self.cleanup_thread and self.cleanup_thread.is_alive():
+        if self.temp_file_manager.is_cleanup_running():
             self.logger.warning("临时文件清理服务已在运行中")
             return
         
-        self.cleanup_thread = threading.Thread(
-            target=self.temp_file_manager.cleanup_loop,
-            daemon=True
-        )
-        self.cleanup_thread.start()
+        self.temp_file_manager.start_cleanup_scheduler()
         self.logger.info("临时文件清理服务已启动")
     
     def stop_cleanup_service(self):
         """停止临时文件清理服务"""
-        if self.cleanup_thread and self.cleanup_thread.is_alive():
-            self.temp_file_manager.stop_event.set()
-            self.cleanup_thread.join(timeout=5)
+        if self.temp_file_manager.is_cleanup_running():
+            self.temp_file_manager.stop_cleanup_scheduler()
             self.logger.info("临时文件清理服务已停止")
     
     def update_cleanup_interval(self, interval_hours: float):
@@ -48,7 +39,7 @@ class TempFileService:
     def get_cleanup_status(self) -> dict:
         """获取清理状态"""
         return {
-            "is_running": self.cleanup_thread and self.cleanup_thread.is_alive(),
+            "is_running": self.temp_file_manager.is_cleanup_running(),
             "cleanup_interval_hours": self.temp_file_manager.get_cleanup_interval_hours(),
             "temp_dirs": self.temp_file_manager.get_temp_directories()
         }
@@ -9,6 +9,11 @@ from typing import Dict, Any, Optional, Callable, Tuple
 from functools import wraps
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class ErrorType(Enum):
     """错误类型枚举"""
     VALIDATION = "validation"      # 参数验证错误
@@ -318,8 +323,28 @@ def convert_to_url(file_path: str) -> str:
         raise ValueError(f"转换文件路径为URL失败: {str(e)}")
 
 
+def dump_json_bytes(data: Any, indent: bool = True) -> bytes:
+    """序列化为UTF-8 JSON字节，优先使用orjson；indent 为假时输出紧凑格式"""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson 不支持的类型（如非字符串键）回退到标准库
+            pass
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
 def print_json_response(response: Dict[str, Any]):
-    """打印JSON响应到标准输出"""
-    print(json.dumps(response, ensure_ascii=False, indent=2))
+    """打印JSON响应到标准输出（直接写入UTF-8字节）"""
+    sys.stdout.flush()
+    out = sys.stdout.buffer
+    out.write(dump_json_bytes(response))
+    out.write(b"\n")
+    out.flush()
     if not response.get("success", False):
         sys.exit(1)
\ No newline at end of file
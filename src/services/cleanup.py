@@ -19,17 +19,29 @@ def cleanup_task():
         logger.error(f"日志清理失败: {str(e)}")
 
 
+# 共享的调度线程，日志清理、临时文件清理等定时任务都注册到 schedule 中由它执行
+_scheduler_thread = None
+_scheduler_lock = threading.Lock()
+
+
 def run_scheduler():
     """调度器运行线程"""
-    # 每天凌晨2点执行清理
-    schedule.every().day.at("02:00").do(cleanup_task)
-    
     while True:
         schedule.run_pending()
         time.sleep(60)  # 每分钟检查一次
 
 
+def ensure_scheduler_running():
+    """启动共享调度线程（进程内只启动一个）"""
+    global _scheduler_thread
+    with _scheduler_lock:
+        if _scheduler_thread is None or not _scheduler_thread.is_alive():
+            _scheduler_thread = threading.Thread(target=run_scheduler, daemon=True, name="Scheduler")
+            _scheduler_thread.start()
+
+
 def start_cleanup_scheduler():
     """启动日志清理调度器"""
-    t = threading.Thread(target=run_scheduler, daemon=True, name="LogCleanup")
-    t.start()
+    # 每天凌晨2点执行清理
+    schedule.every().day.at("02:00").do(cleanup_task)
+    ensure_scheduler_running()